@@ -0,0 +1,33 @@
+"""
+Shared test fixtures.
+"""
+
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from sqlmodel import SQLModel, create_engine
+
+from thriftbot import db
+
+
+def use_temp_database(test, tables=None, modules=()):
+    """Point thriftbot at a fresh SQLite database for the duration of ``test``.
+
+    ``tables`` limits which tables are created (default: all of them).
+    ``modules`` are other modules that imported ``engine`` from thriftbot.db.
+    """
+
+    tmpdir = tempfile.TemporaryDirectory()
+    test.addCleanup(tmpdir.cleanup)
+
+    engine = create_engine(f"sqlite:///{Path(tmpdir.name) / 'test.db'}")
+    test.addCleanup(engine.dispose)
+    SQLModel.metadata.create_all(engine, tables=tables)
+
+    for module in (db, *modules):
+        patcher = mock.patch.object(module, "engine", engine)
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+    return engine
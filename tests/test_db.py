@@ -0,0 +1,50 @@
+"""
+Database layer tests.
+"""
+
+import unittest
+from decimal import Decimal
+
+from thriftbot import db
+from helpers import use_temp_database
+
+
+class ItemCacheTest(unittest.TestCase):
+    """get_item_by_sku only caches inside item_cache_scope()."""
+
+    def setUp(self):
+        use_temp_database(self)
+        db.add_item_to_inventory("25-0001", "Clothing", "Patagonia", "Better Sweater", 7.99)
+
+    def test_lookups_share_one_item_inside_scope(self):
+        with db.item_cache_scope():
+            self.assertIs(db.get_item_by_sku("25-0001"), db.get_item_by_sku("25-0001"))
+
+    def test_no_caching_outside_scope(self):
+        self.assertIsNot(db.get_item_by_sku("25-0001"), db.get_item_by_sku("25-0001"))
+
+    def test_write_clears_cache(self):
+        with db.item_cache_scope():
+            before = db.get_item_by_sku("25-0001")
+            self.assertIsNone(before.suggested_price)
+
+            db.update_item_pricing("25-0001", suggested_price=42.5)
+
+            after = db.get_item_by_sku("25-0001")
+            self.assertIsNot(after, before)
+            self.assertEqual(after.suggested_price, Decimal("42.5"))
+
+    def test_misses_are_not_cached(self):
+        with db.item_cache_scope():
+            self.assertIsNone(db.get_item_by_sku("25-0002"))
+
+            # Bypass the module's write helpers, which would clear the cache anyway
+            with db.Session(db.engine) as session:
+                session.execute(db._insert_item_statement("25-0002", "Books", "Penguin", "Dune", 2.0))
+                session.commit()
+
+            self.assertIsNotNone(db.get_item_by_sku("25-0002"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Photo processing tests.
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from thriftbot import db, images
+from helpers import use_temp_database
+
+
+class BatchProcessOrderTest(unittest.TestCase):
+    """Batch output numbering follows filename order, not directory order."""
+
+    def setUp(self):
+        use_temp_database(self)
+        db.add_item_to_inventory("25-0001", "Clothing", "Patagonia", "Better Sweater", 7.99)
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.input_dir = Path(tmpdir.name) / "photos"
+        self.output_dir = Path(tmpdir.name) / "processed"
+        self.input_dir.mkdir()
+
+        self.names = ["25-0001_a.jpg", "25-0001_b.jpg", "25-0001_c.jpg"]
+        for name in self.names:
+            Image.new("RGB", (32, 32), "white").save(self.input_dir / name)
+
+    def test_photos_numbered_in_filename_order(self):
+        # Hand the files over in reverse, as an unsorted directory listing might
+        reversed_listing = sorted(images.iter_photo_files(self.input_dir), reverse=True)
+
+        with mock.patch.object(images, "iter_photo_files", return_value=iter(reversed_listing)):
+            result = images.batch_process_directory(self.input_dir, self.output_dir, workers=1)
+
+        self.assertEqual(result["errors"], [])
+        item = db.get_item_by_sku("25-0001")
+        self.assertEqual([Path(p).name for p in json.loads(item.photo_paths)], self.names)
+
+        processed = result["processing_results"]["25-0001"]["processed_files"]
+        self.assertTrue(Path(processed[0]).name.startswith("25-0001_01"))
+
+
+if __name__ == "__main__":
+    unittest.main()
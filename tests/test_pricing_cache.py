@@ -0,0 +1,64 @@
+"""
+Pricing analysis when the pricing cache is unavailable.
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from thriftbot import db, pricing
+from helpers import use_temp_database
+
+
+class PricingWithoutCacheTableTest(unittest.TestCase):
+    """Databases from older versions lack pricinganalysiscache until `db init` is re-run."""
+
+    def setUp(self):
+        use_temp_database(
+            self, tables=[db.InventoryItem.__table__, db.MarketComparable.__table__], modules=[pricing]
+        )
+        db.add_item_to_inventory("25-0001", "Clothing", "Patagonia", "Better Sweater", 7.99, size="M")
+
+    def test_analyze_without_cache_table(self):
+        analysis = pricing.analyze_item_pricing("25-0001")
+
+        self.assertEqual(analysis["sku"], "25-0001")
+        self.assertGreater(analysis["market_data"]["total_comparables"], 0)
+        self.assertTrue(analysis["profit_scenarios"])
+
+    def test_refresh_without_cache_table(self):
+        analysis = pricing.analyze_item_pricing("25-0001", use_cache=False)
+
+        self.assertEqual(analysis["sku"], "25-0001")
+
+
+class PricingCacheWriteFailureTest(unittest.TestCase):
+    """A failed cache write still returns the computed analysis."""
+
+    def setUp(self):
+        use_temp_database(self, modules=[pricing])
+        db.add_item_to_inventory("25-0001", "Clothing", "Patagonia", "Better Sweater", 7.99, size="M")
+
+    def test_save_failure_is_ignored(self):
+        with mock.patch.object(pricing, "save_pricing_analysis", side_effect=RuntimeError("disk full")):
+            analysis = pricing.analyze_item_pricing("25-0001", use_cache=False)
+
+        self.assertEqual(analysis["sku"], "25-0001")
+
+    def test_serialization_failure_is_ignored(self):
+        real_dumps = json.dumps
+
+        def dumps(value, *args, **kwargs):
+            # Only the analysis dict fails; the fingerprint still hashes normally
+            if isinstance(value, dict):
+                raise TypeError("not serializable")
+            return real_dumps(value, *args, **kwargs)
+
+        with mock.patch.object(pricing.json, "dumps", side_effect=dumps):
+            analysis = pricing.analyze_item_pricing("25-0001", use_cache=False)
+
+        self.assertEqual(analysis["sku"], "25-0001")
+
+
+if __name__ == "__main__":
+    unittest.main()
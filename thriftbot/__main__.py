@@ -2,7 +2,18 @@
 Entry point for python -m thriftbot execution
 """
 
-from thriftbot.cli import app
+import sys
+
+
+def _fast_path():
+    """Answer `thriftbot version` without loading the CLI."""
+    if sys.argv[1:] == ["version"]:
+        from thriftbot import __version__
+        print(f"ThriftBot v{__version__}")
+        sys.exit(0)
+
 
 if __name__ == "__main__":
+    _fast_path()
+    from thriftbot.cli import app
     app()
\ No newline at end of file
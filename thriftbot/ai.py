@@ -5,144 +5,653 @@ AI-powered content generation for eBay listings using OpenAI.
 """
 
 import os
-from typing import Dict, Optional, List
-from openai import OpenAI
+import re
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import functools
+import threading
+from typing import Dict, Optional, List, Tuple
+import httpx
+from openai import OpenAI, AsyncOpenAI, RateLimitError
 from dotenv import load_dotenv
 
-from thriftbot.db import get_item_by_sku, InventoryItem
+from thriftbot.db import get_item_by_sku, InventoryItem, get_cached_ai_response, save_ai_response
 
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+log = logging.getLogger(__name__)
+
+# OpenAI configuration; the client itself is created on first use
+_api_key = os.getenv("OPENAI_API_KEY")
+_AI_ENABLED = bool(_api_key) and not _api_key.startswith("sk-your-")
+
+# Connection pool shared by all requests made through one client. Keep-alive
+# slots cover the bulk keyword worker count so parallel calls reuse connections.
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=100)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# gpt-4o and newer models get automatic prompt caching; gpt-3.5-turbo does not
+AI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Prompt plus completion budget for one request. 16k is the figure from the
+# request that added max_tokens budgeting, not a model limit: gpt-4o-mini has
+# a 128k context window and separately caps output at 16,384 tokens.
+AI_TOKEN_BUDGET = 16_000
+
+# Bulk generation switches to the Batch API above this many SKUs
+BATCH_THRESHOLD = int(os.getenv("AI_BATCH_THRESHOLD", "20"))
+BATCH_POLL_INTERVAL = 30  # seconds between batch status checks
+
+# Completions are cached locally so identical requests skip the network entirely
+AI_CACHE_TTL_DAYS = int(os.getenv("AI_CACHE_TTL_DAYS", "30"))
+
+# Bulk keyword generation retries rate-limited requests with exponential backoff
+RATE_LIMIT_RETRIES = 5
+
+# Static system prompts. Everything that doesn't vary per item lives here so the
+# message prefix is identical across calls and eligible for OpenAI prompt caching;
+# per-item details are sent afterwards in the user message.
+SYSTEM_TITLE_PROMPT = """
+You write optimized eBay listing titles for thrift store finds.
+
+The user message gives a maximum title length followed by the item details.
+
+Requirements:
+- Never exceed the maximum length
+- Include brand name prominently
+- Use eBay-friendly keywords for searchability
+- Include size and color if available
+- Professional tone
+- No promotional language like "LOOK!" or "WOW!"
+
+Return only the title, nothing else.
+"""
+
+STYLE_PROMPTS = {
+    "professional": "Professional and detailed, highlighting quality and value",
+    "casual": "Friendly and conversational, like talking to a friend",
+    "enthusiastic": "Excited and energetic, emphasizing the great find",
+    "minimalist": "Clean and concise, focusing on key details only"
+}
+
+SYSTEM_DESC_PROMPT = """
+You write eBay listing descriptions for thrift store finds.
+
+The user message names a style, a keyword instruction, and the item details.
+
+Styles:
+""" + "\n".join(f"- {name}: {rubric}" for name, rubric in STYLE_PROMPTS.items()) + """
+
+Requirements:
+- Write in HTML format for eBay listings
+- Include condition details and what to expect
+- Mention fast shipping and return policy
+- Follow the keyword instruction from the user message
+- Encourage buyers to ask questions
+- Professional but approachable tone
+- Highlight the value proposition
+- 150-300 words
+
+Structure:
+1. Item overview and key features
+2. Condition description
+3. Measurements/sizing (if applicable)
+4. Shipping and return info
+5. Call to action
+"""
+
+SYSTEM_KEYWORDS_PROMPT = """
+You generate eBay search keywords for thrift store finds.
+
+The user message gives the number of keywords wanted followed by the item details.
+
+Requirements:
+- Focus on what buyers would search for
+- Include brand, item type, and key attributes
+- Mix specific and general terms
+- No duplicate or overly similar keywords
+- Return a JSON object with a "keywords" array of strings
+
+Example: {"keywords": ["vintage", "authentic", "designer", "size medium", "navy blue", "cotton"]}
+"""
+
+# Per-item user messages, filled in with str.format_map
+_TITLE_USER_TEMPLATE = (
+    "Maximum length: {max_length} characters\n"
+    "\n"
+    "Brand: {brand}\n"
+    "Item: {name}\n"
+    "Category: {category}\n"
+    "Size: {size}\n"
+    "Color: {color}\n"
+    "Condition: {condition}\n"
+)
+
+_DESC_USER_TEMPLATE = (
+    "Style: {style}\n"
+    "Keywords: {keywords}\n"
+    "\n"
+    "Brand: {brand}\n"
+    "Item: {name}\n"
+    "Category: {category}\n"
+    "Size: {size}\n"
+    "Color: {color}\n"
+    "Condition: {condition}\n"
+    "Cost basis: ${cost:.2f}\n"
+)
+
+_KEYWORDS_USER_TEMPLATE = (
+    "Keyword count: {count}\n"
+    "\n"
+    "Brand: {brand}\n"
+    "Item: {name}\n"
+    "Category: {category}\n"
+    "Size: {size}\n"
+    "Color: {color}\n"
+)
+
+
+@functools.cache
+def _get_client() -> OpenAI:
+    """Get the shared OpenAI client, creating it on first use."""
+    return OpenAI(
+        api_key=_api_key,
+        http_client=httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    )
+
+
+def _async_client() -> AsyncOpenAI:
+    """Create an async OpenAI client with the shared pool settings."""
+    return AsyncOpenAI(
+        api_key=_api_key,
+        http_client=httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    )
+
+
+# Async clients are bound to the event loop they're used on. AI coroutines all
+# run on one background loop per process, so a single async client and its
+# keep-alive connections serve every call instead of one client per call.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_shared_aclient: Optional[AsyncOpenAI] = None
+_loop_lock = threading.Lock()
+
+
+def _reset_shared_loop():
+    """Drop the parent's loop in a forked child, where its thread no longer runs."""
+    global _loop, _shared_aclient, _loop_lock
+    _loop = None
+    _shared_aclient = None
+    _loop_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_shared_loop)
+
+
+def _run(coro):
+    """Run a coroutine on the shared background event loop and wait for the result."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="thriftbot-ai", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+def _get_async_client() -> AsyncOpenAI:
+    """Get the shared async client; must be called from the shared loop."""
+    global _shared_aclient
+    if _shared_aclient is None:
+        _shared_aclient = _async_client()
+    return _shared_aclient
 
 
 def generate_listing_content(
     sku: str,
     style: str = "professional",
     include_keywords: bool = True,
-    max_title_length: int = 80
+    max_title_length: int = 80,
+    stream: bool = False
 ) -> Dict[str, str]:
-    """Generate AI-powered title and description for an inventory item."""
+    """Generate AI-powered title and description for an inventory item.
+    
+    With ``stream=True`` the AI description is echoed to stdout as it is generated.
+    """
     
     item = get_item_by_sku(sku)
     if not item:
         raise ValueError(f"Item with SKU {sku} not found")
     
     # Check if API key is available
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or api_key.startswith("sk-your-"):
+    if not _AI_ENABLED:
         return _generate_template_content(item, style, max_title_length)
     
+    # An unchanged item's content is served straight from the response cache,
+    # without starting an event loop or opening an HTTP client
+    if not stream:
+        cached = _read_cached_content(item, style, include_keywords, max_title_length)
+        if cached:
+            title, description = cached
+            return {
+                "title": title,
+                "description": description,
+                "generated_by": "ai",
+                "style": style,
+                "cached": True
+            }
+    
     try:
-        # Generate AI content
-        title = _generate_ai_title(item, max_title_length)
-        description = _generate_ai_description(item, style, include_keywords)
+        # Generate AI content (title and description requests run concurrently)
+        title, description = _run(
+            _generate_ai_content(item, style, include_keywords, max_title_length, stream)
+        )
         
         return {
             "title": title,
             "description": description,
             "generated_by": "ai",
-            "style": style
+            "style": style,
+            "cached": False
         }
         
     except Exception as e:
-        print(f"⚠️  AI generation failed: {e}")
-        print("🔄 Falling back to template generation...")
+        log.warning("AI generation failed for %s, falling back to template: %s", sku, e)
         return _generate_template_content(item, style, max_title_length)
 
 
-def _generate_ai_title(item: InventoryItem, max_length: int = 80) -> str:
-    """Generate an optimized eBay title using AI."""
+def generate_listing_content_bulk(
+    skus: List[str],
+    style: str = "professional",
+    include_keywords: bool = True,
+    max_title_length: int = 80,
+    use_batch: Optional[bool] = None
+) -> Dict[str, Dict[str, str]]:
+    """Generate listing content for many items, using the OpenAI Batch API for large runs.
     
-    prompt = f"""
-    Create an optimized eBay listing title for this item:
-    
-    Brand: {item.brand}
-    Item: {item.name}
-    Category: {item.category}
-    Size: {item.size or "N/A"}
-    Color: {item.color or "N/A"}
-    Condition: {item.condition}
-    
-    Requirements:
-    - Maximum {max_length} characters
-    - Include brand name prominently
-    - Use eBay-friendly keywords for searchability
-    - Include size and color if available
-    - Professional tone
-    - No promotional language like "LOOK!" or "WOW!"
-    
-    Return only the title, nothing else.
+    Batch jobs are billed at half price but can take a while to complete, so they
+    are only used when ``use_batch`` is set or more than BATCH_THRESHOLD SKUs are given.
     """
     
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=50,
-        temperature=0.3
+    items = {}
+    for sku in skus:
+        item = get_item_by_sku(sku)
+        if not item:
+            raise ValueError(f"Item with SKU {sku} not found")
+        items[sku] = item
+    
+    if not _AI_ENABLED:
+        return {
+            sku: _generate_template_content(item, style, max_title_length)
+            for sku, item in items.items()
+        }
+    
+    if use_batch is None:
+        use_batch = len(items) > BATCH_THRESHOLD
+    
+    if not use_batch:
+        contents = _run(
+            _generate_ai_content_many(list(items.values()), style, include_keywords, max_title_length)
+        )
+        
+        results = {}
+        for (sku, item), content in zip(items.items(), contents):
+            if isinstance(content, Exception):
+                log.warning("AI generation failed for %s, falling back to template: %s", sku, content)
+                results[sku] = _generate_template_content(item, style, max_title_length)
+            else:
+                title, description = content
+                results[sku] = {
+                    "title": title,
+                    "description": description,
+                    "generated_by": "ai",
+                    "style": style
+                }
+        return results
+    
+    # One title and one description request per SKU, joined back up by custom_id
+    batch_requests = {}
+    for sku, item in items.items():
+        batch_requests[f"{sku}:title"] = _title_request(item, max_title_length)
+        batch_requests[f"{sku}:desc"] = _description_request(item, style, include_keywords)
+    
+    # Only submit requests that aren't already cached
+    outputs = {}
+    for custom_id, request in list(batch_requests.items()):
+        cached = _read_cache(request)
+        if cached is not None:
+            outputs[custom_id] = cached
+            del batch_requests[custom_id]
+    
+    if batch_requests:
+        try:
+            batch_outputs = _run_batch(batch_requests)
+        except Exception as e:
+            log.warning("AI batch generation failed, falling back to template: %s", e)
+            batch_outputs = {}
+        
+        for custom_id, content in batch_outputs.items():
+            _write_cache(batch_requests[custom_id], content)
+        outputs.update(batch_outputs)
+    
+    results = {}
+    for sku, item in items.items():
+        title = outputs.get(f"{sku}:title")
+        description = outputs.get(f"{sku}:desc")
+        
+        if title and description:
+            results[sku] = {
+                "title": title.strip()[:max_title_length],
+                "description": description.strip(),
+                "generated_by": "ai",
+                "style": style
+            }
+        else:
+            results[sku] = _generate_template_content(item, style, max_title_length)
+    
+    return results
+
+
+def _run_batch(requests: Dict[str, Dict]) -> Dict[str, str]:
+    """Submit chat completion requests as one batch job and wait for the results."""
+    
+    lines = [
+        json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body
+        })
+        for custom_id, body in requests.items()
+    ]
+    
+    client = _get_client()
+    batch_file = client.files.create(
+        file=("thriftbot_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
     )
     
-    title = response.choices[0].message.content.strip()
-    return title[:max_length]  # Ensure length limit
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(BATCH_POLL_INTERVAL)
+        batch = client.batches.retrieve(batch.id)
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        raise Exception(f"Batch {batch.id} finished with status {batch.status}")
+    
+    # Map each custom_id to the message content of its completion
+    outputs = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        
+        result = json.loads(line)
+        response = result.get("response") or {}
+        if response.get("status_code") == 200:
+            outputs[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    
+    return outputs
+
+
+async def _acomplete(aclient: AsyncOpenAI, request: Dict, stream: bool = False) -> str:
+    """Run a chat completion request, serving repeats from the local cache.
+    
+    With ``stream=True`` the response is echoed to stdout as it arrives.
+    """
+    
+    content = _read_cache(request)
+    if content is None:
+        if stream:
+            chunks = []
+            response = await aclient.chat.completions.create(**request, stream=True)
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    sys.stdout.write(delta)
+                    sys.stdout.flush()
+                    chunks.append(delta)
+            content = "".join(chunks)
+        else:
+            response = await aclient.chat.completions.create(**request)
+            content = response.choices[0].message.content
+        _write_cache(request, content)
+    
+    elif stream:
+        sys.stdout.write(content)
+    
+    if stream:
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+    
+    return content
+
+
+def _cache_key(request: Dict) -> str:
+    """Hash the parts of a request that determine its output."""
+    
+    payload = json.dumps([request["model"], request["temperature"], request["messages"]], sort_keys=True)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _read_cache(request: Dict) -> Optional[str]:
+    """Look up a cached response; cache problems are treated as a miss."""
+    
+    try:
+        return get_cached_ai_response(_cache_key(request), AI_CACHE_TTL_DAYS)
+    except Exception:
+        # e.g. the cache table doesn't exist until `db init` is re-run
+        return None
+
+
+def _write_cache(request: Dict, content: str):
+    """Store a response in the cache, ignoring cache write failures."""
+    
+    try:
+        save_ai_response(_cache_key(request), content)
+    except Exception:
+        pass
+
+
+def _read_cached_content(
+    item: InventoryItem,
+    style: str,
+    include_keywords: bool,
+    max_title_length: int
+) -> Optional[Tuple[str, str]]:
+    """Return an item's cached title and description if both are cached.
+    
+    The cache keys hash the full requests, so any change to the item, prompts
+    or model is a miss.
+    """
+    
+    title = _read_cache(_title_request(item, max_title_length))
+    if title is None:
+        return None
+    
+    description = _read_cache(_description_request(item, style, include_keywords))
+    if description is None:
+        return None
+    
+    return title.strip()[:max_title_length], description.strip()
+
+
+def _estimate_prompt_tokens(messages: List[Dict]) -> int:
+    """Estimate prompt tokens (~4 characters per token plus per-message overhead)."""
+    
+    return sum(len(message["content"]) // 4 + 4 for message in messages)
+
+
+def _completion_budget(messages: List[Dict], cap: int) -> int:
+    """Largest max_tokens up to ``cap`` that keeps prompt plus completion within AI_TOKEN_BUDGET.
+    
+    The prompt size is the rough characters/4 estimate, not a tokenizer count.
+    """
+    
+    available = AI_TOKEN_BUDGET - _estimate_prompt_tokens(messages) - 64  # safety margin
+    return max(1, min(cap, available))
+
+
+def _title_request(item: InventoryItem, max_length: int = 80) -> Dict:
+    """Build the chat completion request for an eBay title."""
+    
+    prompt = _TITLE_USER_TEMPLATE.format_map({
+        "max_length": max_length,
+        "brand": item.brand,
+        "name": item.name,
+        "category": item.category,
+        "size": item.size or "N/A",
+        "color": item.color or "N/A",
+        "condition": item.condition
+    })
+    
+    messages = [
+        {"role": "system", "content": SYSTEM_TITLE_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    
+    return {
+        "model": AI_MODEL,
+        "messages": messages,
+        "max_tokens": _completion_budget(messages, 50),
+        "temperature": 0.3,
+        "prompt_cache_key": item.category
+    }
 
 
-def _generate_ai_description(
+def _description_request(
     item: InventoryItem,
     style: str = "professional",
     include_keywords: bool = True
-) -> str:
-    """Generate an optimized eBay description using AI."""
+) -> Dict:
+    """Build the chat completion request for an eBay description."""
+    
+    if style not in STYLE_PROMPTS:
+        style = "professional"
+    
+    prompt = _DESC_USER_TEMPLATE.format_map({
+        "style": style,
+        "keywords": "Include relevant search keywords naturally" if include_keywords else "Focus on description without keyword stuffing",
+        "brand": item.brand,
+        "name": item.name,
+        "category": item.category,
+        "size": item.size or "Not specified",
+        "color": item.color or "See photos",
+        "condition": item.condition,
+        "cost": item.cost
+    })
+    
+    messages = [
+        {"role": "system", "content": SYSTEM_DESC_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
     
-    style_prompts = {
-        "professional": "Professional and detailed, highlighting quality and value",
-        "casual": "Friendly and conversational, like talking to a friend",
-        "enthusiastic": "Excited and energetic, emphasizing the great find",
-        "minimalist": "Clean and concise, focusing on key details only"
+    return {
+        "model": AI_MODEL,
+        "messages": messages,
+        "max_tokens": _completion_budget(messages, 600),
+        "temperature": 0.4,
+        "prompt_cache_key": style
     }
+
+
+async def _generate_ai_content(
+    item: InventoryItem,
+    style: str = "professional",
+    include_keywords: bool = True,
+    max_title_length: int = 80,
+    stream: bool = False
+) -> Tuple[str, str]:
+    """Generate the title and description for an item concurrently."""
     
-    style_instruction = style_prompts.get(style, style_prompts["professional"])
-    
-    prompt = f"""
-    Create an eBay listing description for this thrift store find:
-    
-    Brand: {item.brand}
-    Item: {item.name}
-    Category: {item.category}
-    Size: {item.size or "Not specified"}
-    Color: {item.color or "See photos"}
-    Condition: {item.condition}
-    Cost basis: ${float(item.cost)}
-    
-    Style: {style_instruction}
-    
-    Requirements:
-    - Write in HTML format for eBay listings
-    - Include condition details and what to expect
-    - Mention fast shipping and return policy
-    - {f"Include relevant search keywords naturally" if include_keywords else "Focus on description without keyword stuffing"}
-    - Encourage buyers to ask questions
-    - Professional but approachable tone
-    - Highlight the value proposition
-    - 150-300 words
-    
-    Structure:
-    1. Item overview and key features
-    2. Condition description
-    3. Measurements/sizing (if applicable)
-    4. Shipping and return info
-    5. Call to action
+    aclient = _get_async_client()
+    return await _generate_item_content(aclient, item, style, include_keywords, max_title_length, stream)
+
+
+async def _generate_ai_content_many(
+    items: List[InventoryItem],
+    style: str = "professional",
+    include_keywords: bool = True,
+    max_title_length: int = 80
+) -> List:
+    """Generate content for several items concurrently over one connection pool.
+    
+    Returns a (title, description) tuple per item, or the exception it raised.
     """
     
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=500,
-        temperature=0.4
+    aclient = _get_async_client()
+    return await asyncio.gather(
+        *[
+            _generate_item_content(aclient, item, style, include_keywords, max_title_length)
+            for item in items
+        ],
+        return_exceptions=True
+    )
+
+
+async def _generate_item_content(
+    aclient: AsyncOpenAI,
+    item: InventoryItem,
+    style: str = "professional",
+    include_keywords: bool = True,
+    max_title_length: int = 80,
+    stream: bool = False
+) -> Tuple[str, str]:
+    """Run the title and description requests for one item side by side."""
+    
+    title, description = await asyncio.gather(
+        _generate_ai_title(aclient, item, max_title_length),
+        _generate_ai_description(aclient, item, style, include_keywords, stream)
     )
     
-    return response.choices[0].message.content.strip()
+    return title, description
+
+
+async def _generate_ai_title(aclient: AsyncOpenAI, item: InventoryItem, max_length: int = 80) -> str:
+    """Generate an optimized eBay title using AI."""
+    
+    return (await _acomplete(aclient, _title_request(item, max_length))).strip()[:max_length]  # Ensure length limit
+
+
+async def _generate_ai_description(
+    aclient: AsyncOpenAI,
+    item: InventoryItem,
+    style: str = "professional",
+    include_keywords: bool = True,
+    stream: bool = False
+) -> str:
+    """Generate an optimized eBay description using AI."""
+    
+    description = await _acomplete(aclient, _description_request(item, style, include_keywords), stream)
+    return description.strip()
+
+
+# Static closing sections of the template descriptions
+_MINIMALIST_TEMPLATE_FOOTER = (
+    "<p>Fast shipping within 1 business day.</p>",
+    "<p>30-day returns accepted.</p>",
+    "</div>"
+)
+
+_STANDARD_TEMPLATE_FOOTER = (
+    "</ul>",
+    "<p>Please review photos carefully as they are part of the description. "
+    "Items are gently used thrift finds and may show normal wear consistent with age and use.</p>",
+    "<p><strong>Shipping & Returns:</strong></p>",
+    "<ul>",
+    "<li>Fast shipping within 1 business day</li>",
+    "<li>30-day returns accepted</li>",
+    "<li>Careful packaging to ensure safe delivery</li>",
+    "</ul>",
+    "<p>Questions? Please feel free to message us - we're happy to help!</p>",
+    "</div>"
+)
 
 
 def _generate_template_content(
@@ -164,46 +673,35 @@ def _generate_template_content(
     
     # Generate description based on style
     if style == "minimalist":
-        description = f"""
-        <div>
-        <p><strong>{item.brand} {item.name}</strong></p>
-        <p>Condition: {item.condition}</p>
-        {f"<p>Size: {item.size}</p>" if item.size else ""}
-        {f"<p>Color: {item.color}</p>" if item.color else ""}
-        <p>Fast shipping within 1 business day.</p>
-        <p>30-day returns accepted.</p>
-        </div>
-        """
+        parts = [
+            "<div>",
+            f"<p><strong>{item.brand} {item.name}</strong></p>",
+            f"<p>Condition: {item.condition}</p>"
+        ]
+        if item.size:
+            parts.append(f"<p>Size: {item.size}</p>")
+        if item.color:
+            parts.append(f"<p>Color: {item.color}</p>")
+        parts.extend(_MINIMALIST_TEMPLATE_FOOTER)
     else:
-        description = f"""
-        <div>
-        <h3>{item.brand} {item.name}</h3>
-        
-        <p>Great find from our thrift collection! This <strong>{item.brand} {item.name}</strong> 
-        is in <strong>{item.condition}</strong> condition and ready for a new home.</p>
-        
-        <p><strong>Details:</strong></p>
-        <ul>
-        <li>Brand: {item.brand}</li>
-        <li>Item: {item.name}</li>
-        <li>Condition: {item.condition}</li>
-        {f"<li>Size: {item.size}</li>" if item.size else ""}
-        {f"<li>Color: {item.color}</li>" if item.color else ""}
-        </ul>
-        
-        <p>Please review photos carefully as they are part of the description. 
-        Items are gently used thrift finds and may show normal wear consistent with age and use.</p>
-        
-        <p><strong>Shipping & Returns:</strong></p>
-        <ul>
-        <li>Fast shipping within 1 business day</li>
-        <li>30-day returns accepted</li>
-        <li>Careful packaging to ensure safe delivery</li>
-        </ul>
-        
-        <p>Questions? Please feel free to message us - we're happy to help!</p>
-        </div>
-        """
+        parts = [
+            "<div>",
+            f"<h3>{item.brand} {item.name}</h3>",
+            f"<p>Great find from our thrift collection! This <strong>{item.brand} {item.name}</strong> "
+            f"is in <strong>{item.condition}</strong> condition and ready for a new home.</p>",
+            "<p><strong>Details:</strong></p>",
+            "<ul>",
+            f"<li>Brand: {item.brand}</li>",
+            f"<li>Item: {item.name}</li>",
+            f"<li>Condition: {item.condition}</li>"
+        ]
+        if item.size:
+            parts.append(f"<li>Size: {item.size}</li>")
+        if item.color:
+            parts.append(f"<li>Color: {item.color}</li>")
+        parts.extend(_STANDARD_TEMPLATE_FOOTER)
+    
+    description = "\n".join(parts)
     
     return {
         "title": title,
@@ -216,92 +714,241 @@ def _generate_template_content(
 def suggest_keywords(item: InventoryItem, count: int = 10) -> List[str]:
     """Suggest relevant keywords for the item using AI."""
     
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or api_key.startswith("sk-your-"):
+    if not _AI_ENABLED:
         return _get_template_keywords(item, count)
     
     try:
-        prompt = f"""
-        Generate {count} relevant eBay search keywords for this item:
-        
-        Brand: {item.brand}
-        Item: {item.name}
-        Category: {item.category}
-        Size: {item.size or "N/A"}
-        Color: {item.color or "N/A"}
+        request = _keywords_request(item, count)
         
-        Requirements:
-        - Focus on what buyers would search for
-        - Include brand, item type, and key attributes
-        - Mix specific and general terms
-        - No duplicate or overly similar keywords
-        - Return as a comma-separated list
-        
-        Example: vintage, authentic, designer, size medium, navy blue, cotton
-        """
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=100,
-            temperature=0.3
-        )
+        cached = _read_cache(request)
+        if cached is not None:
+            return _parse_keywords(cached, count)
         
-        keywords_text = response.choices[0].message.content.strip()
-        # Handle both comma-separated and numbered list responses
-        if keywords_text.startswith("1."):
-            # Handle numbered list format
-            lines = keywords_text.split("\n")
-            keywords = []
-            for line in lines:
-                if ". " in line:
-                    keyword = line.split(". ", 1)[1].strip()
-                    if keyword:
-                        keywords.append(keyword)
-        else:
-            # Handle comma-separated format
-            keywords = [k.strip() for k in keywords_text.split(",")]
+        response = _get_client().chat.completions.create(**request)
+        content = response.choices[0].message.content
         
-        return keywords[:count]
+        # Only cache responses that parse, so a malformed one isn't replayed
+        keywords = _parse_keywords(content, count)
+        _write_cache(request, content)
+        return keywords
         
     except Exception as e:
-        print(f"⚠️  AI keyword generation failed: {e}")
+        log.warning("AI keyword generation failed for %s: %s", item.sku, e)
         return _get_template_keywords(item, count)
 
 
+def bulk_suggest_keywords(
+    items: List[InventoryItem],
+    count: int = 10,
+    max_rpm: int = 1500,
+    max_tpm: int = 6_250_000,
+    workers: int = 64
+) -> Dict[str, List[str]]:
+    """Suggest keywords for many items concurrently, keyed by SKU.
+    
+    Requests are dispatched in parallel (at most ``workers`` in flight) and
+    throttled to stay under the account's requests- and tokens-per-minute limits.
+    """
+    
+    if not _AI_ENABLED:
+        return {item.sku: _get_template_keywords(item, count) for item in items}
+    
+    return _run(_bulk_suggest_keywords(items, count, max_rpm, max_tpm, workers))
+
+
+async def _bulk_suggest_keywords(
+    items: List[InventoryItem],
+    count: int,
+    max_rpm: int,
+    max_tpm: int,
+    workers: int
+) -> Dict[str, List[str]]:
+    """Run keyword requests for all items under a shared rate limiter."""
+    
+    limiter = _RateLimiter(max_rpm, max_tpm)
+    semaphore = asyncio.Semaphore(workers)
+    
+    aclient = _get_async_client()
+    keyword_lists = await asyncio.gather(*[
+        _suggest_keywords_limited(aclient, item, count, limiter, semaphore)
+        for item in items
+    ])
+    
+    return {item.sku: keywords for item, keywords in zip(items, keyword_lists)}
+
+
+async def _suggest_keywords_limited(
+    aclient: AsyncOpenAI,
+    item: InventoryItem,
+    count: int,
+    limiter: "_RateLimiter",
+    semaphore: asyncio.Semaphore
+) -> List[str]:
+    """Suggest keywords for one item, retrying with backoff when rate limited."""
+    
+    request = _keywords_request(item, count)
+    
+    # Prompt plus completion budget, which both count against the TPM limit
+    estimated_tokens = _estimate_prompt_tokens(request["messages"]) + request["max_tokens"]
+    
+    cached = _read_cache(request)
+    if cached is not None:
+        return _parse_keywords(cached, count)
+    
+    async with semaphore:
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            await limiter.acquire(estimated_tokens)
+            try:
+                response = await aclient.chat.completions.create(**request)
+                content = response.choices[0].message.content
+                keywords = _parse_keywords(content, count)
+                _write_cache(request, content)
+                return keywords
+            
+            except RateLimitError as e:
+                if attempt == RATE_LIMIT_RETRIES:
+                    log.warning("AI keyword generation failed for %s: %s", item.sku, e)
+                    break
+                await asyncio.sleep(2 ** attempt)
+            
+            except Exception as e:
+                log.warning("AI keyword generation failed for %s: %s", item.sku, e)
+                break
+    
+    return _get_template_keywords(item, count)
+
+
+class _RateLimiter:
+    """Token-bucket limiter for requests-per-minute and tokens-per-minute ceilings."""
+    
+    def __init__(self, max_rpm: int, max_tpm: int):
+        self.max_rpm = max_rpm
+        self.max_tpm = max_tpm
+        self.available_requests = float(max_rpm)
+        self.available_tokens = float(max_tpm)
+        self.last_update = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self, tokens: int):
+        """Wait until one request and ``tokens`` tokens fit under both limits."""
+        
+        tokens = min(tokens, self.max_tpm)
+        
+        async with self.lock:
+            while True:
+                # Refill both buckets for the time elapsed since the last check
+                now = time.monotonic()
+                elapsed = now - self.last_update
+                self.last_update = now
+                self.available_requests = min(self.max_rpm, self.available_requests + elapsed * self.max_rpm / 60)
+                self.available_tokens = min(self.max_tpm, self.available_tokens + elapsed * self.max_tpm / 60)
+                
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+                
+                await asyncio.sleep(0.05)
+
+
+def _keywords_request(item: InventoryItem, count: int = 10) -> Dict:
+    """Build the chat completion request for keyword suggestions."""
+    
+    prompt = _KEYWORDS_USER_TEMPLATE.format_map({
+        "count": count,
+        "brand": item.brand,
+        "name": item.name,
+        "category": item.category,
+        "size": item.size or "N/A",
+        "color": item.color or "N/A"
+    })
+    
+    messages = [
+        {"role": "system", "content": SYSTEM_KEYWORDS_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    
+    return {
+        "model": AI_MODEL,
+        "messages": messages,
+        "max_tokens": _completion_budget(messages, 100),
+        "temperature": 0.3,
+        "prompt_cache_key": item.category,
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "keywords",
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "keywords": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "maxItems": count
+                        }
+                    },
+                    "required": ["keywords"]
+                }
+            }
+        }
+    }
+
+
+def _parse_keywords(keywords_json: str, count: int = 10) -> List[str]:
+    """Parse a structured keyword response."""
+    
+    keywords = json.loads(keywords_json)["keywords"]
+    return [k.strip() for k in keywords if k.strip()][:count]
+
+
+# Generic keywords added to template keywords by category
+_CATEGORY_KEYWORDS = {
+    "clothing": ("fashion", "style", "apparel", "wear"),
+    "electronics": ("tech", "gadget", "device"),
+    "home": ("decor", "household", "interior"),
+    "books": ("literature", "reading", "educational"),
+    "toys": ("play", "kids", "children", "fun")
+}
+
+
 def _get_template_keywords(item: InventoryItem, count: int = 10) -> List[str]:
     """Generate template keywords when AI is not available."""
     
+    category = item.category.lower()
+    
     keywords = [
         item.brand.lower(),
         item.name.lower(),
-        item.category.lower(),
+        category,
         item.condition.lower()
     ]
     
     if item.size:
-        keywords.extend([item.size.lower(), f"size {item.size.lower()}"])
+        size = item.size.lower()
+        keywords.extend([size, f"size {size}"])
     if item.color:
-        keywords.extend([item.color.lower()])
+        keywords.append(item.color.lower())
     
     # Add generic keywords based on category
-    category_keywords = {
-        "clothing": ["fashion", "style", "apparel", "wear"],
-        "electronics": ["tech", "gadget", "device"],
-        "home": ["decor", "household", "interior"],
-        "books": ["literature", "reading", "educational"],
-        "toys": ["play", "kids", "children", "fun"]
-    }
-    
-    category_key = item.category.lower()
-    if category_key in category_keywords:
-        keywords.extend(category_keywords[category_key])
+    keywords.extend(_CATEGORY_KEYWORDS.get(category, ()))
     
     # Remove duplicates and return requested count
     unique_keywords = list(dict.fromkeys(keywords))  # Preserve order while removing dupes
     return unique_keywords[:count]
 
 
+# Title analysis pattern, compiled once so a title is scanned in a single pass.
+# Brand, color and condition words match anywhere in the title ("levi" matches
+# "levi's"); size words must stand alone so single letters like "s" or "m"
+# don't match inside other words.
+_TITLE_ELEMENTS_RE = re.compile("|".join([
+    r"(?P<has_brand>nike|adidas|apple|samsung|levi|patagonia|north face)",
+    r"(?P<has_size>\b(?:size|small|medium|large|xl|xs|s|m|l)\b)",
+    r"(?P<has_color>black|white|red|blue|green|yellow|pink|gray|brown)",
+    r"(?P<has_condition>new|excellent|good|fair|used|vintage)",
+]))
+
+
 def analyze_title_optimization(title: str) -> Dict[str, any]:
     """Analyze a title for eBay optimization."""
     
@@ -317,20 +964,9 @@ def analyze_title_optimization(title: str) -> Dict[str, any]:
         "suggestions": []
     }
     
-    title_lower = title.lower()
-    
     # Check for common elements
-    common_brands = ["nike", "adidas", "apple", "samsung", "levi", "patagonia", "north face"]
-    analysis["has_brand"] = any(brand in title_lower for brand in common_brands)
-    
-    size_indicators = ["size", "small", "medium", "large", "xl", "xs", "s", "m", "l"]
-    analysis["has_size"] = any(size in title_lower for size in size_indicators)
-    
-    color_words = ["black", "white", "red", "blue", "green", "yellow", "pink", "gray", "brown"]
-    analysis["has_color"] = any(color in title_lower for color in color_words)
-    
-    condition_words = ["new", "excellent", "good", "fair", "used", "vintage"]
-    analysis["has_condition"] = any(condition in title_lower for condition in condition_words)
+    for match in _TITLE_ELEMENTS_RE.finditer(title.lower()):
+        analysis[match.lastgroup] = True
     
     # Generate suggestions
     if not analysis["length_ok"]:
@@ -2,13 +2,143 @@
 ThriftBot CLI - Main command-line interface
 """
 
-import typer
-from typing import Optional
+import os
+import re
+import json
+import time
+import queue
+import functools
+import contextvars
+import threading
+import random
+import traceback
+from decimal import Decimal
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import typer
+
+try:
+    from orjson import loads as _json_loads  # Optional, faster JSON parsing
+except ImportError:
+    _json_loads = json.loads
+
 from thriftbot import __version__
-from thriftbot.db import init_database, add_item_to_inventory
-from thriftbot.exporters import export_to_ebay_csv
+
+# thriftbot.db, pricing and exporters load SQLModel/SQLAlchemy, so commands
+# import them when they run; version and --help never pay for the ORM
+
+# Photo types picked up from a folder during onboarding
+ONBOARD_PHOTO_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+# Listings longer than this are printed as tab-separated rows instead of a grid
+PLAIN_TABLE_THRESHOLD = 1000
+
+# Batch-pipeline suggested prices are saved in groups of this many items, or
+# once the oldest unsaved price is this many seconds old
+PRICE_WRITE_BATCH_SIZE = 32
+PRICE_WRITE_INTERVAL = 1.0
+
+# Default worker count for batch-pipeline --threads
+BATCH_THREAD_WORKERS = 8
+
+# Pass/fail and urgency markers for report output
+_CHECK_MARK = "\u2705"
+_X_MARK = "\u274c"
+_URGENCY_MARKS = {"high": "🔴", "medium": "🟡", "low": "🟢"}
+
+# Patterns for turning HTML descriptions into plain-text previews
+_HTML_TAG_RE = re.compile(r'<[^<>]+>')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+
+# Table cells that _render_table right-aligns
+_INTEGER_RE = re.compile(r'-?\d+')
+
+# Static menus and banners, each written with a single echo
+_START_MENU = "\n".join([
+    "",
+    "🏁 Welcome to ThriftBot!",
+    "   Let's get you started with the right approach...",
+    "",
+    "🚀 Choose your experience level:",
+    "   1. 🌱 New to reselling - I need step-by-step guidance",
+    "   2. ⚡ Experienced - I just want to add items quickly",
+    "   3. 📚 View all commands and explore",
+    "   4. 📋 Check my current inventory",
+    "",
+])
+
+_USEFUL_COMMANDS = "\n".join([
+    "\n💡 Useful commands to try:",
+    "   📅 python -m thriftbot item list          # View inventory",
+    "   🤖 python -m thriftbot ai describe --sku SKU # Generate content",
+    "   💰 python -m thriftbot pricing analyze --sku SKU # Analyze pricing",
+    "   🚀 python -m thriftbot workflow pipeline --sku SKU # Full workflow",
+])
+
+_ONBOARD_WELCOME = "\n".join([
+    "",
+    "🎉 Welcome to ThriftBot Interactive Onboarding!",
+    "   Let's get your first item set up step-by-step.",
+    "",
+    "📝 I'll walk you through adding an item, generating content, and getting it ready for eBay.",
+    "",
+    "📦 STEP 1: Item Identification",
+    "   First, let's identify what you're selling...",
+    "",
+])
+
+_ONBOARD_PHOTO_STEP = "\n".join([
+    "",
+    "📷 STEP 5: Photo Setup",
+    "   Let's set up photos for your listing...",
+    "",
+])
+
+_ONBOARD_COMPLETE = "\n".join([
+    "\n" + "=" * 60,
+    "🎉 ONBOARDING COMPLETE!",
+    "=" * 60,
+])
+
+_ONBOARD_SIGN_OFF = "\n".join([
+    "\n💡 Pro tip: Run 'thriftbot onboard' again to add more items!",
+    "\n🙏 Happy selling!",
+])
+
+# Onboarding choices and their pre-rendered menus
+_CATEGORIES = (
+    "Clothing", "Electronics", "Books", "Home & Garden", "Sports & Outdoors",
+    "Collectibles", "Toys & Games", "Health & Beauty", "Automotive", "Crafts"
+)
+
+_CONDITIONS = {
+    "1": "New - Brand new, never used",
+    "2": "New with Tags - New but tags may be removed",
+    "3": "New without Tags - New but no original tags",
+    "4": "Excellent - Barely used, like new condition",
+    "5": "Very Good - Light use, minor wear",
+    "6": "Good - Normal wear, still great condition",
+    "7": "Fair - Obvious wear but fully functional"
+}
+
+_CONDITION_MAP = {
+    "1": "New", "2": "New with Tags", "3": "New without Tags",
+    "4": "Excellent", "5": "Very Good", "6": "Good", "7": "Fair"
+}
+
+_CATEGORY_MENU = "\n".join(
+    ["", "📂 Popular categories:"]
+    + [f"   {i:2d}. {cat}" for i, cat in enumerate(_CATEGORIES, 1)]
+)
+
+_CONDITION_MENU = "\n".join(
+    ["", "🔍 Condition Guide:"]
+    + [f"   {key}. {desc}" for key, desc in _CONDITIONS.items()]
+)
 
 app = typer.Typer(
     name="thriftbot",
@@ -49,6 +179,61 @@ ebay_app = typer.Typer(help="Direct eBay API integration")
 app.add_typer(ebay_app, name="ebay")
 
 
+def _strip_html(description: str) -> str:
+    """Strip HTML tags and collapse blank lines for terminal display."""
+    return _BLANK_LINES_RE.sub('\n', _HTML_TAG_RE.sub('', description).strip())
+
+
+def _render_table(headers: List[str], rows: List[List[Any]]) -> str:
+    """Render single-line cells as a grid table matching tabulate's "grid" format.
+    
+    Like tabulate, headers get two spaces of padding and columns of whole
+    numbers are right-aligned.
+    """
+    
+    widths = [len(header) + 2 for header in headers]
+    numeric = [True] * len(headers)
+    cells = []
+    
+    # One pass converts the cells to text and measures the columns
+    for row in rows:
+        text_row = ["" if cell is None else str(cell) for cell in row]
+        for i, cell in enumerate(text_row):
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+            if numeric[i] and cell and not _INTEGER_RE.fullmatch(cell):
+                numeric[i] = False
+        cells.append(text_row)
+    
+    line = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    header_line = "+" + "+".join("=" * (width + 2) for width in widths) + "+"
+    row_format = "| " + " | ".join(
+        f"{{:{'>' if is_numeric else '<'}{width}}}" for width, is_numeric in zip(widths, numeric)
+    ) + " |"
+    
+    lines = [line, row_format.format(*headers), header_line]
+    for row in cells:
+        lines.append(row_format.format(*row))
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _format_money(amount: Optional[Decimal]) -> str:
+    """Format an optional money column, showing "-" when it's unset or zero."""
+    # Decimal formats itself directly; no need to round-trip through float
+    return f"${amount:.2f}" if amount else "-"
+
+
+def _json_list_length(value: Optional[str]) -> int:
+    """Count the entries in a JSON list column, treating bad or missing data as empty."""
+    if not value or value == "[]":
+        return 0
+    try:
+        return len(_json_loads(value))
+    except (ValueError, TypeError):
+        return 0
+
+
 @app.command()
 def version():
     """Show ThriftBot version."""
@@ -58,67 +243,44 @@ def version():
 @app.command()
 def start():
     """🏁 Getting started guide - choose your path based on experience level."""
-    typer.echo("")
-    typer.echo("🏁 Welcome to ThriftBot!")
-    typer.echo("   Let's get you started with the right approach...")
-    typer.echo("")
+    from sqlalchemy.exc import OperationalError
+    from thriftbot.db import init_database, count_inventory_items
     
-    typer.echo("🚀 Choose your experience level:")
-    typer.echo("   1. 🌱 New to reselling - I need step-by-step guidance")
-    typer.echo("   2. ⚡ Experienced - I just want to add items quickly")
-    typer.echo("   3. 📚 View all commands and explore")
-    typer.echo("   4. 📋 Check my current inventory")
-    typer.echo("")
+    typer.echo(_START_MENU)
     
     choice = typer.prompt("What would you like to do? (1-4)", default="1")
     
     if choice == "1":
         typer.echo("\n🌱 Perfect! Let's walk through everything step-by-step...")
         typer.echo("🔄 Starting interactive onboarding...\n")
-        from thriftbot.cli import onboard
-        import sys
-        # Call onboard function directly
-        try:
-            onboard()
-        except:
-            typer.echo("\n💡 You can also run: python -m thriftbot onboard")
+        # Call onboard function directly; it reports its own errors and cancellation
+        onboard()
     
     elif choice == "2":
         typer.echo("\n⚡ Great! Let's add an item quickly...")
         typer.echo("🔄 Starting quick entry...\n")
-        try:
-            quick()
-        except:
-            typer.echo("\n💡 You can also run: python -m thriftbot quick")
+        quick()
     
     elif choice == "3":
         typer.echo("\n📚 Here are all available commands:\n")
-        import subprocess
-        subprocess.run(["python", "-m", "thriftbot", "--help"])
-        
-        typer.echo("\n💡 Useful commands to try:")
-        typer.echo("   📅 python -m thriftbot item list          # View inventory")
-        typer.echo("   🤖 python -m thriftbot ai describe --sku SKU # Generate content")
-        typer.echo("   💰 python -m thriftbot pricing analyze --sku SKU # Analyze pricing")
-        typer.echo("   🚀 python -m thriftbot workflow pipeline --sku SKU # Full workflow")
+        _print_app_help()
+        
+        typer.echo(_USEFUL_COMMANDS)
     
     elif choice == "4":
         typer.echo("\n📋 Current inventory:")
         try:
-            from thriftbot.db import get_inventory_items
-            items = get_inventory_items()
-            if items:
-                typer.echo(f"   You have {len(items)} items in inventory\n")
-                import subprocess
-                subprocess.run(["python", "-m", "thriftbot", "item", "list", "--show-pricing", "--limit", "10"])
+            count = count_inventory_items()
+            if count:
+                typer.echo(f"   You have {count} items in inventory\n")
+                list_items(status=None, category=None, limit=10, show_photos=False, show_pricing=True)
             else:
                 typer.echo("   Your inventory is empty - let's add your first item!")
                 typer.echo("\n🔄 Starting onboarding...\n")
                 onboard()
-        except:
+        except OperationalError:
             typer.echo("   Database not initialized. Let me set that up...")
             try:
-                from thriftbot.db import init_database
                 init_database()
                 typer.echo("   ✅ Database ready! Let's add your first item:\n")
                 onboard()
@@ -129,58 +291,88 @@ def start():
         typer.echo("\n💡 Invalid choice. Run 'python -m thriftbot start' to try again.")
 
 
+@functools.cache
+def _sku_prefix() -> str:
+    """Year-month prefix for suggested SKUs, read from the clock once per run."""
+    return datetime.now().strftime("%y-%m")
+
+
+def _suggest_sku() -> str:
+    """Suggest a SKU like 25-10-1234."""
+    return f"{_sku_prefix()}-{random.randint(1000, 9999)}"
+
+
+def _print_app_help():
+    """Print the top-level --help text without starting another interpreter."""
+    
+    command = typer.main.get_command(app)
+    with typer.Context(command, info_name="python -m thriftbot") as ctx:
+        # With rich installed, Typer prints the help itself and returns ""
+        help_text = command.get_help(ctx)
+    if help_text:
+        typer.echo(help_text)
+
+
+def _prompt_float(
+    message: str,
+    min_value: Optional[float] = None,
+    invalid_message: str = "❌ Invalid number",
+    below_min_message: Optional[str] = None
+) -> float:
+    """Ask for a number until a valid one is entered, using plain input()."""
+    
+    while True:
+        try:
+            value = float(input(f"{message}: ").strip())
+        except EOFError:
+            raise typer.Abort()
+        except ValueError:
+            typer.echo(invalid_message)
+            continue
+        if min_value is not None and value < min_value:
+            typer.echo(below_min_message or f"❌ Must be at least {min_value}")
+            continue
+        return value
+
+
 @app.command()
 def quick():
     """⚡ Quick item entry - minimal questions for experienced users."""
+    from thriftbot.db import add_item_if_sku_free
+    
     try:
-        from datetime import datetime
-        import random
-        from thriftbot.db import get_item_by_sku
-        
         typer.echo("\n⚡ ThriftBot Quick Entry")
         typer.echo("   Fast item addition for experienced users\n")
         
         # Generate SKU
-        year = datetime.now().strftime("%y")
-        month = datetime.now().strftime("%m")
-        rand = random.randint(1000, 9999)
-        suggested_sku = f"{year}-{month}-{rand}"
+        suggested_sku = _suggest_sku()
         
         # Quick prompts
         sku = typer.prompt(f"SKU [{suggested_sku}]", default=suggested_sku).strip()
         
-        # Check SKU
-        if get_item_by_sku(sku):
-            rand = random.randint(1000, 9999)
-            sku = f"{year}-{month}-{rand}"
-            typer.echo(f"⚠️  SKU taken, using: {sku}")
-        
         category = typer.prompt("Category").strip()
         brand = typer.prompt("Brand").strip()
         name = typer.prompt("Name").strip()
         
-        while True:
-            try:
-                cost = float(typer.prompt("Cost ($)"))
-                break
-            except ValueError:
-                typer.echo("❌ Invalid number")
+        cost = _prompt_float("Cost ($)", min_value=0)
         
         # Optional fields
         size = typer.prompt("Size [skip]", default="").strip() or None
         color = typer.prompt("Color [skip]", default="").strip() or None
         condition = typer.prompt("Condition [Good]", default="Good").strip()
         
-        # Add item
-        item_id = add_item_to_inventory(
-            sku=sku, category=category, brand=brand, name=name,
-            size=size, cost=cost, condition=condition, color=color
-        )
+        # Add item, checking the SKU in the same transaction
+        fields = dict(category=category, brand=brand, name=name, size=size, cost=cost, condition=condition, color=color)
+        item_id = add_item_if_sku_free(sku, **fields)
+        while item_id is None:
+            sku = _suggest_sku()
+            typer.echo(f"⚠️  SKU taken, using: {sku}")
+            item_id = add_item_if_sku_free(sku, **fields)
         
         typer.echo(f"\n✅ Added: {name} (#{item_id})")
         typer.echo(f"💡 Next: python -m thriftbot workflow pipeline --sku {sku}\n")
         
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, typer.Abort):
         typer.echo("\n👋 Cancelled\n")
     except Exception as e:
         typer.echo(f"❌ Error: {e}")
@@ -189,58 +381,27 @@ def quick():
 @app.command()
 def onboard():
     """🚀 Interactive setup guide for new users - step-by-step item onboarding."""
+    from thriftbot.db import (
+        add_item_if_sku_free, update_ai_content, update_item_pricing, update_photo_paths
+    )
+    from thriftbot.pricing import analyze_item_pricing, best_roi_scenario
+    from thriftbot.exporters import export_to_ebay_csv
+    
     try:
-        from pathlib import Path
-        import re
-        from thriftbot.db import get_item_by_sku
+        # Welcome message and Step 1: Basic Item Information
+        typer.echo(_ONBOARD_WELCOME)
         
-        # Welcome message
-        typer.echo("")
-        typer.echo("🎉 Welcome to ThriftBot Interactive Onboarding!")
-        typer.echo("   Let's get your first item set up step-by-step.")
-        typer.echo("")
-        typer.echo("📝 I'll walk you through adding an item, generating content, and getting it ready for eBay.")
-        typer.echo("")
-        
-        # Step 1: Basic Item Information
-        typer.echo("📦 STEP 1: Item Identification")
-        typer.echo("   First, let's identify what you're selling...")
-        typer.echo("")
-        
-        # SKU Generation Helper
-        def generate_suggested_sku():
-            from datetime import datetime
-            import random
-            year = datetime.now().strftime("%y")
-            month = datetime.now().strftime("%m")
-            rand = random.randint(1000, 9999)
-            return f"{year}-{month}-{rand}"
-        
-        suggested_sku = generate_suggested_sku()
+        suggested_sku = _suggest_sku()
         sku_prompt = f"🏷️  Enter a unique SKU (item ID) or press Enter for suggested: {suggested_sku}"
         sku_input = typer.prompt(sku_prompt, default="").strip()
         sku = sku_input if sku_input else suggested_sku
         
-        # Check if SKU already exists
-        existing_item = get_item_by_sku(sku)
-        if existing_item:
-            typer.echo(f"⚠️  SKU '{sku}' already exists! Let me suggest a new one...")
-            sku = generate_suggested_sku()
-            typer.echo(f"✅ Using SKU: {sku}")
-        
         # Category with suggestions
-        typer.echo("")
-        typer.echo("📂 Popular categories:")
-        categories = [
-            "Clothing", "Electronics", "Books", "Home & Garden", "Sports & Outdoors",
-            "Collectibles", "Toys & Games", "Health & Beauty", "Automotive", "Crafts"
-        ]
-        for i, cat in enumerate(categories, 1):
-            typer.echo(f"   {i:2d}. {cat}")
+        typer.echo(_CATEGORY_MENU)
         
         category = typer.prompt("\n📂 What category is your item? (or type custom)").strip()
-        if category.isdigit() and 1 <= int(category) <= len(categories):
-            category = categories[int(category) - 1]
+        if category.isdigit() and 1 <= int(category) <= len(_CATEGORIES):
+            category = _CATEGORIES[int(category) - 1]
         
         # Brand
         typer.echo("")
@@ -256,41 +417,20 @@ def onboard():
         color = typer.prompt("🎨 Color/finish (e.g., Blue, Black, Silver)", default="").strip() or None
         
         # Condition with explanations
-        typer.echo("")
-        typer.echo("🔍 Condition Guide:")
-        conditions = {
-            "1": "New - Brand new, never used",
-            "2": "New with Tags - New but tags may be removed", 
-            "3": "New without Tags - New but no original tags",
-            "4": "Excellent - Barely used, like new condition",
-            "5": "Very Good - Light use, minor wear",
-            "6": "Good - Normal wear, still great condition",
-            "7": "Fair - Obvious wear but fully functional"
-        }
-        
-        for key, desc in conditions.items():
-            typer.echo(f"   {key}. {desc}")
+        typer.echo(_CONDITION_MENU)
         
         condition_input = typer.prompt("\n🔍 Select condition (1-7)", default="6")
-        condition_map = {
-            "1": "New", "2": "New with Tags", "3": "New without Tags",
-            "4": "Excellent", "5": "Very Good", "6": "Good", "7": "Fair"
-        }
-        condition = condition_map.get(condition_input, "Good")
+        condition = _CONDITION_MAP.get(condition_input, "Good")
         
         # Cost
         typer.echo("")
         typer.echo("💰 STEP 3: Cost Information")
-        while True:
-            try:
-                cost_input = typer.prompt("💸 How much did you pay for this item? (in dollars, e.g., 12.99)")
-                cost = float(cost_input)
-                if cost < 0:
-                    typer.echo("❌ Cost must be positive. Please try again.")
-                    continue
-                break
-            except ValueError:
-                typer.echo("❌ Please enter a valid number (e.g., 12.99)")
+        cost = _prompt_float(
+            "💸 How much did you pay for this item? (in dollars, e.g., 12.99)",
+            min_value=0,
+            invalid_message="❌ Please enter a valid number (e.g., 12.99)",
+            below_min_message="❌ Cost must be positive. Please try again."
+        )
         
         # Show summary before adding
         typer.echo("")
@@ -313,12 +453,15 @@ def onboard():
             typer.echo("❌ Cancelled. Run 'python -m thriftbot onboard' again to start over.")
             return
         
-        # Add to inventory
+        # Add to inventory, checking the SKU in the same transaction
         try:
-            item_id = add_item_to_inventory(
-                sku=sku, category=category, brand=brand, name=name,
-                size=size, cost=cost, condition=condition, color=color
-            )
+            fields = dict(category=category, brand=brand, name=name, size=size, cost=cost, condition=condition, color=color)
+            item_id = add_item_if_sku_free(sku, **fields)
+            while item_id is None:
+                typer.echo(f"⚠️  SKU '{sku}' already exists! Let me suggest a new one...")
+                sku = _suggest_sku()
+                typer.echo(f"✅ Using SKU: {sku}")
+                item_id = add_item_if_sku_free(sku, **fields)
             typer.echo(f"\n✅ Successfully added '{name}' to your inventory!")
             typer.echo(f"   Item ID: {item_id}")
         except Exception as e:
@@ -326,10 +469,7 @@ def onboard():
             return
         
         # Step 5: Photo Setup
-        typer.echo("")
-        typer.echo("📷 STEP 5: Photo Setup")
-        typer.echo("   Let's set up photos for your listing...")
-        typer.echo("")
+        typer.echo(_ONBOARD_PHOTO_STEP)
         
         photo_paths = []
         photos_directory = None
@@ -368,10 +508,13 @@ def onboard():
                     else:
                         typer.echo("⚠️  You'll need to create the directory and add photos manually later.")
                 else:
-                    # Check for existing photos
-                    photo_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.bmp'}
-                    existing_photos = [f for f in photos_path.iterdir() 
-                                     if f.is_file() and f.suffix.lower() in photo_extensions]
+                    # Check for existing photos; scandir entries know their file type
+                    # from the directory listing, so no stat call per file
+                    existing_photos = []
+                    with os.scandir(photos_path) as entries:
+                        for entry in entries:
+                            if entry.name.lower().endswith(ONBOARD_PHOTO_EXTENSIONS) and entry.is_file():
+                                existing_photos.append(entry)
                     
                     if existing_photos:
                         typer.echo(f"\n📷 Found {len(existing_photos)} photos in {photos_dir}:")
@@ -380,7 +523,7 @@ def onboard():
                         if len(existing_photos) > 5:
                             typer.echo(f"   ... and {len(existing_photos) - 5} more")
                         
-                        photo_paths = [str(p) for p in existing_photos]
+                        photo_paths = [photo.path for photo in existing_photos]
                     else:
                         typer.echo(f"\n📁 Directory exists but no photos found.")
                         typer.echo(f"💡 Add photos to {photos_dir} and run photo processing later.")
@@ -394,9 +537,9 @@ def onboard():
                     if not photo_path:
                         break
                     
-                    if Path(photo_path).exists():
+                    if os.path.isfile(photo_path):
                         photo_paths.append(photo_path)
-                        typer.echo(f"   ✅ Added: {Path(photo_path).name}")
+                        typer.echo(f"   ✅ Added: {os.path.basename(photo_path)}")
                         photo_num += 1
                     else:
                         typer.echo(f"   ❌ File not found: {photo_path}")
@@ -413,20 +556,11 @@ def onboard():
             typer.echo(f"   python3 -m thriftbot photo process --sku {sku} --input-dir photos/{sku}")
         
         # Store photo information (if we have it)
-        if photo_paths or photos_directory:
+        if photo_paths:
             try:
-                import json
-                from thriftbot.db import Session, engine, select, InventoryItem
-                
                 # Update the item with photo information
-                with Session(engine) as session:
-                    statement = select(InventoryItem).where(InventoryItem.sku == sku)
-                    item = session.exec(statement).first()
-                    if item and photo_paths:
-                        item.photo_paths = json.dumps(photo_paths)
-                        session.add(item)
-                        session.commit()
-                        typer.echo(f"\n💾 Saved {len(photo_paths)} photo paths to database")
+                if update_photo_paths(sku, photo_paths):
+                    typer.echo(f"\n💾 Saved {len(photo_paths)} photo paths to database")
                         
             except Exception as e:
                 typer.echo(f"\n⚠️  Could not save photo paths: {e}")
@@ -442,7 +576,6 @@ def onboard():
             typer.echo("\n🤖 Generating professional listing content...")
             try:
                 from thriftbot.ai import generate_listing_content
-                from thriftbot.db import update_ai_content
                 
                 content = generate_listing_content(sku=sku, style="professional", include_keywords=True)
                 
@@ -462,8 +595,7 @@ def onboard():
                 
                 typer.echo(f"\n📄 DESCRIPTION:")
                 # Clean description for display
-                clean_desc = re.sub('<[^<]+?>', '', content['description'])
-                clean_desc = re.sub(r'\n\s*\n', '\n', clean_desc.strip())
+                clean_desc = _strip_html(content['description'])
                 preview = clean_desc[:300] + "..." if len(clean_desc) > 300 else clean_desc
                 typer.echo(f"   {preview}")
                 
@@ -476,7 +608,6 @@ def onboard():
         if typer.confirm("\n💰 Would you like me to analyze pricing for maximum profit?"):
             typer.echo("\n💰 Analyzing market pricing...")
             try:
-                from thriftbot.pricing import analyze_item_pricing
                 analysis = analyze_item_pricing(sku)
                 
                 typer.echo("\n" + "="*50)
@@ -489,12 +620,11 @@ def onboard():
                 typer.echo(f"   💛 Competitive: ${pricing['competitive']} (market rate)")
                 typer.echo(f"   💰 Aggressive: ${pricing['aggressive']} (maximum profit)")
                 
-                best_roi = max(analysis['profit_scenarios'], key=lambda x: x['profit']['roi_percentage'])
+                best_roi = best_roi_scenario(analysis['profit_scenarios'])
                 typer.echo(f"\n🎯 Best ROI: {best_roi['strategy']} at ${best_roi['price']}")
                 typer.echo(f"   💵 Profit: ${best_roi['profit']['net_profit']} ({best_roi['profit']['roi_percentage']}% ROI)")
                 
                 # Update item with competitive pricing
-                from thriftbot.db import update_item_pricing
                 update_item_pricing(sku, suggested_price=float(pricing['competitive']))
                 typer.echo(f"\n✅ Updated item with competitive price: ${pricing['competitive']}")
                 
@@ -502,16 +632,12 @@ def onboard():
                 typer.echo(f"❌ Error analyzing pricing: {e}")
         
         # Final steps and export
-        typer.echo("\n" + "="*60)
-        typer.echo("🎉 ONBOARDING COMPLETE!")
-        typer.echo("="*60)
-        
+        typer.echo(_ONBOARD_COMPLETE)
         typer.echo(f"\n✅ Your item '{name}' is ready for listing!")
         
         # Ask about CSV export
         if typer.confirm("\n📤 Export to eBay-ready CSV file now?"):
             try:
-                from datetime import datetime
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 output_file = f"drafts/{sku}_onboard_{timestamp}.csv"
                 
@@ -537,10 +663,9 @@ def onboard():
         typer.echo(f"   4. 🚀 Full workflow: python3 -m thriftbot workflow pipeline --sku {sku}")
         typer.echo(f"   5. 🌐 List on eBay: Upload the CSV file or use API integration")
         
-        typer.echo("\n💡 Pro tip: Run 'thriftbot onboard' again to add more items!")
-        typer.echo("\n🙏 Happy selling!")
+        typer.echo(_ONBOARD_SIGN_OFF)
         
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, typer.Abort):
         typer.echo("\n\n👋 Onboarding cancelled. Run again anytime!")
     except Exception as e:
         typer.echo(f"\n❌ Onboarding error: {e}")
@@ -550,6 +675,8 @@ def onboard():
 @db_app.command("init")
 def init_db():
     """Initialize the ThriftBot database."""
+    from thriftbot.db import init_database
+    
     try:
         init_database()
         typer.echo("✅ Database initialized successfully!")
@@ -570,6 +697,8 @@ def add_item(
     color: Optional[str] = typer.Option(None, help="Item color"),
 ):
     """Add a new item to inventory."""
+    from thriftbot.db import add_item_to_inventory
+    
     try:
         item_id = add_item_to_inventory(
             sku=sku,
@@ -596,20 +725,15 @@ def list_items(
     show_pricing: bool = typer.Option(False, help="Show pricing information")
 ):
     """List inventory items with optional filtering."""
+    from thriftbot.db import get_inventory_items_with_summary
+    
     try:
-        from thriftbot.db import get_inventory_items
-        from tabulate import tabulate
-        import json
-        
-        items = get_inventory_items(status=status, category=category)
+        items, summary = get_inventory_items_with_summary(status=status, category=category, limit=limit)
         
         if not items:
             typer.echo("📋 No items found matching criteria")
             return
         
-        # Limit results
-        items = items[:limit]
-        
         # Prepare table data
         headers = ["SKU", "Brand", "Name", "Category", "Condition", "Cost", "Status"]
         
@@ -628,48 +752,36 @@ def list_items(
                 item.name[:20] + "..." if len(item.name) > 20 else item.name,
                 item.category,
                 item.condition,
-                f"${float(item.cost):.2f}",
+                f"${item.cost:.2f}",
                 item.status
             ]
             
             if show_pricing:
-                suggested = f"${float(item.suggested_price):.2f}" if item.suggested_price else "-"
-                listed = f"${float(item.listed_price):.2f}" if item.listed_price else "-"
-                sold = f"${float(item.sold_price):.2f}" if item.sold_price else "-"
-                net_profit = f"${float(item.net_profit):.2f}" if item.net_profit else "-"
-                row.extend([suggested, listed, sold, net_profit])
+                row.extend([
+                    _format_money(item.suggested_price),
+                    _format_money(item.listed_price),
+                    _format_money(item.sold_price),
+                    _format_money(item.net_profit)
+                ])
             
             if show_photos:
-                photo_count = 0
-                processed_count = 0
-                
-                if item.photo_paths:
-                    try:
-                        photos = json.loads(item.photo_paths)
-                        photo_count = len(photos)
-                    except:
-                        pass
-                
-                if item.processed_photos:
-                    try:
-                        processed = json.loads(item.processed_photos)
-                        processed_count = len(processed)
-                    except:
-                        pass
-                
-                row.extend([str(photo_count), str(processed_count)])
+                row.extend([str(_json_list_length(item.photo_paths)), str(_json_list_length(item.processed_photos))])
             
             table_data.append(row)
         
         typer.echo(f"📋 Inventory Items ({len(items)} shown)\n")
-        typer.echo(tabulate(table_data, headers=headers, tablefmt="grid"))
+        if len(table_data) > PLAIN_TABLE_THRESHOLD:
+            # Grid layout gets slow for large listings; write tab-separated rows in one go
+            typer.echo("\n".join("\t".join(row) for row in [headers, *table_data]))
+        else:
+            typer.echo(_render_table(headers, table_data))
         
         # Summary stats
-        total_cost = sum(float(item.cost) for item in items)
-        total_value = sum(float(item.suggested_price or 0) for item in items)
+        total_cost = summary["total_cost"]
+        total_value = summary["total_value"]
         
         typer.echo(f"\n📊 Summary:")
-        typer.echo(f"   Total items: {len(items)}")
+        typer.echo(f"   Total items: {summary['count']}")
         typer.echo(f"   Total cost: ${total_cost:.2f}")
         typer.echo(f"   Total suggested value: ${total_value:.2f}")
         typer.echo(f"   Potential profit: ${total_value - total_cost:.2f}")
@@ -685,11 +797,15 @@ def export_ebay_csv(
     include_sold: bool = typer.Option(False, help="Include sold items")
 ):
     """Export inventory to eBay-compatible CSV."""
+    from thriftbot.exporters import export_to_ebay_csv, EXPORT_PROGRESS_INTERVAL
+    
     try:
-        export_path = Path(output)
-        export_path.parent.mkdir(parents=True, exist_ok=True)
+        def show_progress(count: int):
+            typer.echo(f"\r   ...{count} rows", nl=False, err=True)
         
-        result = export_to_ebay_csv(str(export_path), include_sold=include_sold)
+        result = export_to_ebay_csv(output, include_sold=include_sold, progress=show_progress)
+        if result['count'] >= EXPORT_PROGRESS_INTERVAL:
+            typer.echo("", err=True)
         typer.echo(f"✅ Exported {result['count']} items to {output}")
     except Exception as e:
         typer.echo(f"❌ Error exporting CSV: {e}", err=True)
@@ -702,9 +818,12 @@ def generate_description(
     use_ai: bool = typer.Option(True, help="Use AI for description generation"),
     style: str = typer.Option("professional", help="Description style: professional, casual, enthusiastic, minimalist"),
     keywords: bool = typer.Option(True, help="Include SEO keywords in description"),
-    save: bool = typer.Option(False, help="Save generated content to database")
+    save: bool = typer.Option(False, help="Save generated content to database"),
+    stream: bool = typer.Option(False, help="Print the AI description as it is generated")
 ):
     """Generate optimized eBay title and description."""
+    from thriftbot.db import update_ai_content
+    
     try:
         from thriftbot.ai import generate_listing_content
         
@@ -714,7 +833,8 @@ def generate_description(
             sku=sku,
             style=style,
             include_keywords=keywords,
-            max_title_length=80
+            max_title_length=80,
+            stream=stream
         )
         
         typer.echo("\n" + "="*60)
@@ -726,14 +846,11 @@ def generate_description(
         
         typer.echo(f"\n📄 DESCRIPTION:")
         # Strip HTML tags for CLI display
-        import re
-        clean_desc = re.sub('<[^<]+?>', '', content['description'])
-        clean_desc = re.sub(r'\n\s*\n', '\n', clean_desc.strip())
+        clean_desc = _strip_html(content['description'])
         typer.echo(f"   {clean_desc[:200]}..." if len(clean_desc) > 200 else f"   {clean_desc}")
         
         if save:
             try:
-                from thriftbot.db import update_ai_content
                 update_ai_content(
                     sku=sku,
                     title=content['title'],
@@ -757,9 +874,10 @@ def suggest_item_keywords(
     count: int = typer.Option(10, help="Number of keywords to generate")
 ):
     """Generate SEO keywords for an inventory item."""
+    from thriftbot.db import get_item_by_sku
+    
     try:
         from thriftbot.ai import suggest_keywords
-        from thriftbot.db import get_item_by_sku
         
         item = get_item_by_sku(sku)
         if not item:
@@ -797,24 +915,22 @@ def analyze_title(
         typer.echo("📈 TITLE ANALYSIS")
         typer.echo("="*50)
         
-        check_mark = "\u2705"
-        x_mark = "\u274c"
         
-        typer.echo(f"\nLength: {analysis['length']}/{analysis['max_length']} characters {check_mark if analysis['length_ok'] else x_mark}")
+        typer.echo(f"\nLength: {analysis['length']}/{analysis['max_length']} characters {_CHECK_MARK if analysis['length_ok'] else _X_MARK}")
         typer.echo(f"Word count: {analysis['word_count']}")
         
         typer.echo(f"\nOptimization checklist:")
-        typer.echo(f"  Brand mentioned: {check_mark if analysis['has_brand'] else x_mark}")
-        typer.echo(f"  Size included: {check_mark if analysis['has_size'] else x_mark}")
-        typer.echo(f"  Color mentioned: {check_mark if analysis['has_color'] else x_mark}")
-        typer.echo(f"  Condition stated: {check_mark if analysis['has_condition'] else x_mark}")
+        typer.echo(f"  Brand mentioned: {_CHECK_MARK if analysis['has_brand'] else _X_MARK}")
+        typer.echo(f"  Size included: {_CHECK_MARK if analysis['has_size'] else _X_MARK}")
+        typer.echo(f"  Color mentioned: {_CHECK_MARK if analysis['has_color'] else _X_MARK}")
+        typer.echo(f"  Condition stated: {_CHECK_MARK if analysis['has_condition'] else _X_MARK}")
         
         if analysis['suggestions']:
             typer.echo(f"\n💡 Suggestions:")
             for suggestion in analysis['suggestions']:
                 typer.echo(f"  - {suggestion}")
         else:
-            typer.echo(f"\n{check_mark} Title looks well optimized!")
+            typer.echo(f"\n{_CHECK_MARK} Title looks well optimized!")
         
     except Exception as e:
         typer.echo(f"\u274c Error analyzing title: {e}", err=True)
@@ -829,7 +945,8 @@ def process_photos(
     output_dir: str = typer.Option("processed", help="Output directory for processed photos"),
     remove_bg: bool = typer.Option(True, help="Remove background from photos"),
     enhance: bool = typer.Option(True, help="Apply image enhancement"),
-    variants: bool = typer.Option(True, help="Create photo variants (square, thumbnail)")
+    variants: bool = typer.Option(True, help="Create photo variants (square, thumbnail)"),
+    workers: Optional[int] = typer.Option(None, help="Photos to process in parallel (default: PHOTO_WORKERS)")
 ):
     """Process photos for an inventory item."""
     try:
@@ -843,7 +960,8 @@ def process_photos(
             output_dir=output_dir,
             remove_background=remove_bg,
             enhance=enhance,
-            create_variants=variants
+            create_variants=variants,
+            workers=workers
         )
         
         typer.echo(f"\n✅ Photo processing complete!")
@@ -868,7 +986,8 @@ def batch_process(
     input_dir: str = typer.Option("photos", help="Input directory with photos"),
     output_dir: str = typer.Option("processed", help="Output directory for processed photos"),
     remove_bg: bool = typer.Option(False, help="Remove background (slower for batch)"),
-    enhance: bool = typer.Option(True, help="Apply image enhancement")
+    enhance: bool = typer.Option(True, help="Apply image enhancement"),
+    workers: Optional[int] = typer.Option(None, help="Photos per item to process in parallel (default: PHOTO_WORKERS)")
 ):
     """Batch process all photos in directory by detected SKU."""
     try:
@@ -880,7 +999,8 @@ def batch_process(
             input_dir=input_dir,
             output_dir=output_dir,
             remove_background=remove_bg,
-            enhance=enhance
+            enhance=enhance,
+            workers=workers
         )
         
         typer.echo(f"\n✅ Batch processing complete!")
@@ -958,47 +1078,53 @@ def photo_suggestions(
 # Pricing commands
 @pricing_app.command("analyze")
 def analyze_pricing(
-    sku: str = typer.Option(..., help="Item SKU to analyze pricing for")
+    sku: str = typer.Option(..., help="Item SKU to analyze pricing for"),
+    refresh: bool = typer.Option(False, help="Ignore any cached analysis and recompute")
 ):
     """Analyze pricing for an inventory item with market research."""
+    from thriftbot.pricing import analyze_item_pricing
+    
     try:
-        from thriftbot.pricing import analyze_item_pricing
-        
         typer.echo(f"💰 Analyzing pricing for {sku}...")
         
-        analysis = analyze_item_pricing(sku)
+        analysis = analyze_item_pricing(sku, use_cache=not refresh)
+        
+        # The report is written in one go once it's complete
+        out = _OutputBuffer()
         
         item_info = analysis['item_info']
-        typer.echo(f"\n📝 Item: {item_info['brand']} {item_info['name']}")
-        typer.echo(f"   Category: {item_info['category']}")
-        typer.echo(f"   Condition: {item_info['condition']}")
-        typer.echo(f"   Cost: ${item_info['cost']}")
+        out.echo(f"\n📝 Item: {item_info['brand']} {item_info['name']}")
+        out.echo(f"   Category: {item_info['category']}")
+        out.echo(f"   Condition: {item_info['condition']}")
+        out.echo(f"   Cost: ${item_info['cost']}")
         
         # Market data
         market = analysis['market_data']
-        typer.echo(f"\n📈 Market Analysis ({market['total_comparables']} comparables):")
+        out.echo(f"\n📈 Market Analysis ({market['total_comparables']} comparables):")
         price_range = market['price_range']
-        typer.echo(f"   Range: ${price_range['min']} - ${price_range['max']}")
-        typer.echo(f"   Average: ${price_range['average']}")
-        typer.echo(f"   Median: ${price_range['median']}")
+        out.echo(f"   Range: ${price_range['min']} - ${price_range['max']}")
+        out.echo(f"   Average: ${price_range['average']}")
+        out.echo(f"   Median: ${price_range['median']}")
         
         # Pricing suggestions
         pricing = analysis['pricing_analysis']['suggested_prices']
-        typer.echo(f"\n🏷️  Suggested Pricing:")
-        typer.echo(f"   Conservative: ${pricing['conservative']}")
-        typer.echo(f"   Competitive: ${pricing['competitive']}")
-        typer.echo(f"   Aggressive: ${pricing['aggressive']}")
+        out.echo(f"\n🏷️  Suggested Pricing:")
+        out.echo(f"   Conservative: ${pricing['conservative']}")
+        out.echo(f"   Competitive: ${pricing['competitive']}")
+        out.echo(f"   Aggressive: ${pricing['aggressive']}")
         
         # Profit scenarios
-        typer.echo(f"\n📊 Profit Scenarios:")
-        for scenario in analysis['profit_scenarios']:
-            profit = scenario['profit']
-            typer.echo(f"   {scenario['strategy']}: ${scenario['price']} → ${profit['net_profit']} profit ({profit['roi_percentage']}% ROI)")
+        out.echo(f"\n📊 Profit Scenarios:")
+        out.echo("\n".join(
+            f"   {s['strategy']}: ${s['price']} → ${s['profit']['net_profit']} profit ({s['profit']['roi_percentage']}% ROI)"
+            for s in analysis['profit_scenarios']
+        ))
         
         # Recommendations
-        typer.echo(f"\n💡 Recommendations:")
-        for rec in analysis['recommendations']:
-            typer.echo(f"   - {rec}")
+        out.echo(f"\n💡 Recommendations:")
+        out.echo("\n".join(f"   - {rec}" for rec in analysis['recommendations']))
+        
+        out.flush()
         
     except Exception as e:
         typer.echo(f"\u274c Error analyzing pricing: {e}", err=True)
@@ -1010,9 +1136,9 @@ def calculate_breakeven(
     sku: str = typer.Option(..., help="Item SKU to calculate break-even for")
 ):
     """Calculate break-even price for an item."""
+    from thriftbot.pricing import calculate_break_even_price
+    
     try:
-        from thriftbot.pricing import calculate_break_even_price
-        
         result = calculate_break_even_price(sku)
         
         typer.echo(f"💰 Break-even Analysis: {sku}")
@@ -1038,9 +1164,9 @@ def suggest_adjustments(
     sku: str = typer.Option(..., help="Item SKU to suggest price adjustments for")
 ):
     """Suggest price adjustments for items that aren't selling."""
+    from thriftbot.pricing import suggest_price_adjustments
+    
     try:
-        from thriftbot.pricing import suggest_price_adjustments
-        
         result = suggest_price_adjustments(sku)
         
         if 'message' in result:
@@ -1054,7 +1180,7 @@ def suggest_adjustments(
         if result['suggestions']:
             typer.echo(f"\n💡 Suggestions:")
             for suggestion in result['suggestions']:
-                urgency = "🔴" if suggestion['urgency'] == 'high' else "🟡" if suggestion['urgency'] == 'medium' else "🟢"
+                urgency = _URGENCY_MARKS.get(suggestion['urgency'], "🟢")
                 typer.echo(f"   {urgency} {suggestion['type'].title()}:")
                 typer.echo(f"      Current: ${suggestion['current_price']} → Suggested: ${suggestion['suggested_price']}")
                 typer.echo(f"      Reason: {suggestion['reason']}")
@@ -1071,6 +1197,34 @@ def suggest_adjustments(
 
 
 # Workflow commands
+class _OutputBuffer:
+    """Collect CLI output lines and write them to the terminal in one call."""
+    
+    def __init__(self):
+        self._lines: List[str] = []
+    
+    def echo(self, message: str = ""):
+        self._lines.append(message)
+    
+    def flush(self):
+        if self._lines:
+            typer.echo("\n".join(self._lines))
+            self._lines.clear()
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of running the workflow pipeline for one item."""
+    
+    sku: str
+    steps_completed: List[str] = field(default_factory=list)
+    steps_skipped: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    ai_content: Optional[Dict[str, str]] = None
+    pricing: Optional[Dict[str, Any]] = None
+    export_file: Optional[str] = None
+
+
 @workflow_app.command("pipeline")
 def run_pipeline(
     sku: str = typer.Option(..., help="Item SKU to process through complete pipeline"),
@@ -1081,153 +1235,340 @@ def run_pipeline(
     style: str = typer.Option("professional", help="AI content style: professional, casual, enthusiastic, minimalist")
 ):
     """Run complete processing pipeline for an item: photos → AI content → pricing → export."""
+    from thriftbot.db import update_item_pricing, item_cache_scope
+    from thriftbot.pricing import analyze_item_pricing, best_roi_scenario
+    from thriftbot.exporters import export_to_ebay_csv
     
-    typer.echo(f"🚀 Starting complete pipeline for {sku}...")
+    out = _OutputBuffer()
+    out.echo(f"🚀 Starting complete pipeline for {sku}...")
     
-    pipeline_results = {
-        "sku": sku,
-        "steps_completed": [],
-        "steps_skipped": [],
-        "errors": []
-    }
+    pipeline_results = PipelineResult(sku=sku)
     
-    # Step 1: Photo Processing
-    if not skip_photos:
-        typer.echo(f"\n📷 Step 1: Processing photos...")
-        try:
-            from thriftbot.images import process_item_photos, find_item_photos
-            from pathlib import Path
-            
-            # Check if photos exist
-            photo_files = find_item_photos(sku, Path("photos"))
-            if photo_files:
-                result = process_item_photos(
+    # Neither the AI content nor the pricing analysis depends on the processed
+    # photos or on each other, so start both now and let them run while the
+    # photos are processed; results are still reported in step order. Items
+    # looked up during the run are cached until it finishes.
+    with item_cache_scope(), ThreadPoolExecutor(max_workers=2) as executor:
+        ai_future = None
+        if not skip_ai:
+            ai_future = _submit_in_scope(
+                executor,
+                lambda: _ai_module().generate_listing_content(
                     sku=sku,
-                    input_dir="photos",
-                    output_dir="processed",
-                    remove_background=True,
-                    enhance=True,
-                    create_variants=True
+                    style=style,
+                    include_keywords=True,
+                    max_title_length=80
                 )
-                typer.echo(f"   ✅ Processed {result['processed_count']} photo variants")
-                pipeline_results["steps_completed"].append("photo_processing")
-            else:
-                typer.echo(f"   ⚠️  No photos found for {sku} - skipping photo processing")
-                pipeline_results["steps_skipped"].append("photo_processing")
-                
-        except Exception as e:
-            typer.echo(f"   ❌ Photo processing failed: {e}")
-            pipeline_results["errors"].append(f"Photo processing: {e}")
-    else:
-        pipeline_results["steps_skipped"].append("photo_processing")
-    
-    # Step 2: AI Content Generation
-    if not skip_ai:
-        typer.echo(f"\n🤖 Step 2: Generating AI content...")
-        try:
-            from thriftbot.ai import generate_listing_content
-            
-            content = generate_listing_content(
-                sku=sku,
-                style=style,
-                include_keywords=True,
-                max_title_length=80
             )
-            
-            typer.echo(f"   ✅ Generated {content['generated_by']} content ({len(content['title'])} char title)")
-            pipeline_results["steps_completed"].append("ai_content")
-            pipeline_results["ai_content"] = {
-                "title": content["title"],
-                "method": content["generated_by"]
-            }
-            
-        except Exception as e:
-            typer.echo(f"   ❌ AI content generation failed: {e}")
-            pipeline_results["errors"].append(f"AI content: {e}")
-    else:
-        pipeline_results["steps_skipped"].append("ai_content")
-    
-    # Step 3: Pricing Analysis
-    if not skip_pricing:
-        typer.echo(f"\n💰 Step 3: Analyzing pricing...")
-        try:
-            from thriftbot.pricing import analyze_item_pricing
-            from thriftbot.db import update_item_pricing
-            
-            analysis = analyze_item_pricing(sku)
-            
-            # Update item with suggested pricing
-            competitive_price = analysis["pricing_analysis"]["suggested_prices"]["competitive"]
-            update_item_pricing(sku, suggested_price=competitive_price)
-            
-            typer.echo(f"   ✅ Suggested competitive price: ${competitive_price}")
-            
-            best_roi = max(analysis["profit_scenarios"], key=lambda x: x["profit"]["roi_percentage"])
-            typer.echo(f"   ✅ Best ROI: {best_roi['strategy']} at ${best_roi['price']} ({best_roi['profit']['roi_percentage']}% ROI)")
-            
-            pipeline_results["steps_completed"].append("pricing_analysis")
-            pipeline_results["pricing"] = {
-                "suggested_price": competitive_price,
-                "best_roi_strategy": best_roi["strategy"],
-                "best_roi_price": best_roi["price"],
-                "best_roi_percentage": best_roi["profit"]["roi_percentage"]
-            }
-            
-        except Exception as e:
-            typer.echo(f"   ❌ Pricing analysis failed: {e}")
-            pipeline_results["errors"].append(f"Pricing analysis: {e}")
-    else:
-        pipeline_results["steps_skipped"].append("pricing_analysis")
+        pricing_future = None if skip_pricing else _submit_in_scope(executor, analyze_item_pricing, sku)
+        
+        # Step 1: Photo Processing
+        if not skip_photos:
+            out.echo(f"\n📷 Step 1: Processing photos...")
+            out.flush()
+            try:
+                from thriftbot.images import process_item_photos, find_item_photos
+                
+                # Check if photos exist
+                input_path = Path("photos")
+                photo_files = find_item_photos(sku, input_path)
+                if photo_files:
+                    result = process_item_photos(
+                        sku=sku,
+                        input_dir=input_path,
+                        output_dir=Path("processed"),
+                        remove_background=True,
+                        enhance=True,
+                        create_variants=True,
+                        photo_files=photo_files
+                    )
+                    out.echo(f"   ✅ Processed {result['processed_count']} photo variants")
+                    pipeline_results.steps_completed.append("photo_processing")
+                else:
+                    out.echo(f"   ⚠️  No photos found for {sku} - skipping photo processing")
+                    pipeline_results.steps_skipped.append("photo_processing")
+                    
+            except Exception as e:
+                out.echo(f"   ❌ Photo processing failed: {e}")
+                pipeline_results.errors.append(f"Photo processing: {e}")
+        else:
+            pipeline_results.steps_skipped.append("photo_processing")
+        
+        # Step 2: AI Content Generation
+        if not skip_ai:
+            out.echo(f"\n🤖 Step 2: Generating AI content...")
+            out.flush()
+            try:
+                content = ai_future.result()
+                
+                out.echo(f"   ✅ Generated {content['generated_by']} content ({len(content['title'])} char title)")
+                pipeline_results.steps_completed.append("ai_content")
+                pipeline_results.ai_content = {
+                    "title": content["title"],
+                    "method": content["generated_by"]
+                }
+                
+            except Exception as e:
+                out.echo(f"   ❌ AI content generation failed: {e}")
+                pipeline_results.errors.append(f"AI content: {e}")
+        else:
+            pipeline_results.steps_skipped.append("ai_content")
+        
+        # Step 3: Pricing Analysis
+        if not skip_pricing:
+            out.echo(f"\n💰 Step 3: Analyzing pricing...")
+            out.flush()
+            try:
+                analysis = pricing_future.result()
+                
+                # Update item with suggested pricing
+                competitive_price = analysis["pricing_analysis"]["suggested_prices"]["competitive"]
+                update_item_pricing(sku, suggested_price=competitive_price)
+                
+                out.echo(f"   ✅ Suggested competitive price: ${competitive_price}")
+                
+                best_roi = best_roi_scenario(analysis["profit_scenarios"])
+                out.echo(f"   ✅ Best ROI: {best_roi['strategy']} at ${best_roi['price']} ({best_roi['profit']['roi_percentage']}% ROI)")
+                
+                pipeline_results.steps_completed.append("pricing_analysis")
+                pipeline_results.pricing = {
+                    "suggested_price": competitive_price,
+                    "best_roi_strategy": best_roi["strategy"],
+                    "best_roi_price": best_roi["price"],
+                    "best_roi_percentage": best_roi["profit"]["roi_percentage"]
+                }
+                
+            except Exception as e:
+                out.echo(f"   ❌ Pricing analysis failed: {e}")
+                pipeline_results.errors.append(f"Pricing analysis: {e}")
+        else:
+            pipeline_results.steps_skipped.append("pricing_analysis")
     
     # Step 4: Auto Export (if requested)
     if auto_export:
-        typer.echo(f"\n📤 Step 4: Exporting to CSV...")
+        out.echo(f"\n📤 Step 4: Exporting to CSV...")
+        out.flush()
         try:
-            from thriftbot.exporters import export_to_ebay_csv
-            from datetime import datetime
-            
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = f"drafts/{sku}_pipeline_{timestamp}.csv"
             
             result = export_to_ebay_csv(output_file, include_sold=False)
-            typer.echo(f"   ✅ Exported to {output_file}")
+            out.echo(f"   ✅ Exported to {output_file}")
             
-            pipeline_results["steps_completed"].append("csv_export")
-            pipeline_results["export_file"] = output_file
+            pipeline_results.steps_completed.append("csv_export")
+            pipeline_results.export_file = output_file
             
         except Exception as e:
-            typer.echo(f"   ❌ CSV export failed: {e}")
-            pipeline_results["errors"].append(f"CSV export: {e}")
+            out.echo(f"   ❌ CSV export failed: {e}")
+            pipeline_results.errors.append(f"CSV export: {e}")
     
     # Pipeline Summary
-    typer.echo(f"\n" + "="*60)
-    typer.echo(f"🏁 PIPELINE COMPLETE: {sku}")
-    typer.echo(f"="*60)
+    out.echo(f"\n" + "="*60)
+    out.echo(f"🏁 PIPELINE COMPLETE: {sku}")
+    out.echo(f"="*60)
     
-    typer.echo(f"\n✅ Steps completed: {len(pipeline_results['steps_completed'])}")
-    for step in pipeline_results["steps_completed"]:
-        typer.echo(f"   - {step.replace('_', ' ').title()}")
+    out.echo(f"\n✅ Steps completed: {len(pipeline_results.steps_completed)}")
+    for step in pipeline_results.steps_completed:
+        out.echo(f"   - {step.replace('_', ' ').title()}")
     
-    if pipeline_results["steps_skipped"]:
-        typer.echo(f"\n⏭️  Steps skipped: {len(pipeline_results['steps_skipped'])}")
-        for step in pipeline_results["steps_skipped"]:
-            typer.echo(f"   - {step.replace('_', ' ').title()}")
+    if pipeline_results.steps_skipped:
+        out.echo(f"\n⏭️  Steps skipped: {len(pipeline_results.steps_skipped)}")
+        for step in pipeline_results.steps_skipped:
+            out.echo(f"   - {step.replace('_', ' ').title()}")
     
-    if pipeline_results["errors"]:
-        typer.echo(f"\n❌ Errors encountered: {len(pipeline_results['errors'])}")
-        for error in pipeline_results["errors"]:
-            typer.echo(f"   - {error}")
-        typer.echo(f"\n⚠️  Pipeline completed with errors. Review item manually.")
+    if pipeline_results.errors:
+        out.echo(f"\n❌ Errors encountered: {len(pipeline_results.errors)}")
+        for error in pipeline_results.errors:
+            out.echo(f"   - {error}")
+        out.echo(f"\n⚠️  Pipeline completed with errors. Review item manually.")
     else:
-        typer.echo(f"\n🎉 Pipeline completed successfully! Item ready for listing.")
+        out.echo(f"\n🎉 Pipeline completed successfully! Item ready for listing.")
     
     # Show next steps
-    typer.echo(f"\n📝 Next Steps:")
-    typer.echo(f"   1. Review generated content: python -m thriftbot ai describe --sku {sku}")
-    typer.echo(f"   2. Check pricing: python -m thriftbot pricing analyze --sku {sku}")
+    out.echo(f"\n📝 Next Steps:")
+    out.echo(f"   1. Review generated content: python -m thriftbot ai describe --sku {sku}")
+    out.echo(f"   2. Check pricing: python -m thriftbot pricing analyze --sku {sku}")
     if not auto_export:
-        typer.echo(f"   3. Export for eBay: python -m thriftbot export ebay-csv")
-    typer.echo(f"   4. List item on eBay using generated content")
+        out.echo(f"   3. Export for eBay: python -m thriftbot export ebay-csv")
+    out.echo(f"   4. List item on eBay using generated content")
+    out.flush()
+
+
+def _safe_call(fn, *args, verbose: bool = False, **kwargs) -> Tuple[bool, Any]:
+    """Call fn, returning (True, result) or (False, error message).
+    
+    The full traceback is only formatted when verbose is set.
+    """
+    try:
+        return True, fn(*args, **kwargs)
+    except Exception as e:
+        return False, traceback.format_exc().rstrip() if verbose else str(e)
+
+
+def _submit_in_scope(executor, fn, *args):
+    """Submit fn to run in a copy of the caller's context.
+    
+    Executor threads don't inherit context variables, so this is how stage
+    threads share the caller's item_cache_scope().
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def _init_batch_worker():
+    """Drop database connections inherited from the parent process."""
+    from thriftbot.db import engine
+    
+    engine.dispose(close=False)
+
+
+class _PriceWriter:
+    """Save suggested prices in small batches from a background thread.
+    
+    Worker processes only compute prices. Every write goes through this one
+    thread and connection, so SQLite keeps a single writer, and prices are
+    stored as the batch runs instead of all at the end.
+    """
+    
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._error: Optional[Exception] = None
+        self.saved = 0
+        self._thread = threading.Thread(target=self._run, name="price-writer", daemon=True)
+        self._thread.start()
+    
+    def put(self, sku: str, price: float):
+        self._queue.put((sku, price))
+    
+    def close(self) -> int:
+        """Save any queued prices and stop the thread; returns the number saved."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error:
+            raise self._error
+        return self.saved
+    
+    def _run(self):
+        pending: Dict[str, float] = {}
+        flush_at = 0.0
+        
+        while True:
+            timeout = max(flush_at - time.monotonic(), 0) if pending else None
+            try:
+                entry = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush(pending)
+                continue
+            
+            if entry is None:
+                self._flush(pending)
+                return
+            
+            if not pending:
+                flush_at = time.monotonic() + PRICE_WRITE_INTERVAL
+            sku, price = entry
+            pending[sku] = price
+            if len(pending) >= PRICE_WRITE_BATCH_SIZE:
+                self._flush(pending)
+    
+    def _flush(self, pending: Dict[str, float]):
+        from thriftbot.db import update_suggested_prices
+        
+        if not pending:
+            return
+        try:
+            update_suggested_prices(pending)
+            self.saved += len(pending)
+        except Exception as e:
+            self._error = self._error or e
+        pending.clear()
+
+
+@functools.cache
+def _images_module():
+    """Import thriftbot.images once, on first use; it pulls in rembg."""
+    from thriftbot import images
+    return images
+
+
+@functools.cache
+def _ai_module():
+    """Import thriftbot.ai once, on first use; it pulls in the OpenAI SDK."""
+    from thriftbot import ai
+    return ai
+
+
+@functools.cache
+def _pricing_module():
+    """Import thriftbot.pricing once, on first use."""
+    from thriftbot import pricing
+    return pricing
+
+
+def _batch_photo_stage(sku: str, input_path: Path, output_path: Path, photo_files: List[Path]) -> str:
+    """Process an item's photos for the batch pipeline."""
+    
+    if not photo_files:
+        return f"   ⚠️  No photos found"
+    
+    result = _images_module().process_item_photos(
+        sku=sku, input_dir=input_path, output_dir=output_path, photo_files=photo_files
+    )
+    return f"   ✅ Photos: {result['processed_count']} files"
+
+
+def _batch_ai_stage(sku: str, style: str) -> Dict[str, Any]:
+    """Generate an item's listing content for the batch pipeline."""
+    return _ai_module().generate_listing_content(sku=sku, style=style)
+
+
+def _batch_pricing_stage(sku: str) -> float:
+    """Work out an item's competitive price for the batch pipeline."""
+    analysis = _pricing_module().analyze_item_pricing(sku)
+    return analysis["pricing_analysis"]["suggested_prices"]["competitive"]
+
+
+def _run_batch_item(
+    sku: str,
+    input_path: Path,
+    output_path: Path,
+    photo_files: List[Path],
+    skip_photos: bool,
+    skip_ai: bool,
+    skip_pricing: bool,
+    style: str
+) -> Dict[str, Any]:
+    """Run the pipeline stages for one SKU.
+    
+    Returns the item's progress lines, its suggested price (which the caller
+    stores for the whole batch at once) and whether its AI content came from
+    the cache. Runs in a worker process or thread, so
+    output is collected rather than echoed to keep each item's lines
+    together. The stages don't depend on each other, so they run on threads:
+    photo work overlaps the AI and pricing I/O, and they share one item cache.
+    """
+    result = {"lines": [], "suggested_price": None, "ai_cached": None}
+    lines = result["lines"]
+    
+    from thriftbot.db import item_cache_scope
+    
+    with item_cache_scope(), ThreadPoolExecutor(max_workers=3) as executor:
+        photo_future = None if skip_photos else _submit_in_scope(executor, _batch_photo_stage, sku, input_path, output_path, photo_files)
+        ai_future = None if skip_ai else _submit_in_scope(executor, _batch_ai_stage, sku, style)
+        pricing_future = None if skip_pricing else _submit_in_scope(executor, _batch_pricing_stage, sku)
+        
+        if photo_future:
+            lines.append(photo_future.result())
+        if ai_future:
+            content = ai_future.result()
+            # Template content has no "cached" flag and isn't counted either way
+            result["ai_cached"] = content.get("cached")
+            source = "cached" if result["ai_cached"] else "content generated"
+            lines.append(f"   ✅ AI: {content['generated_by']} {source}")
+        if pricing_future:
+            result["suggested_price"] = pricing_future.result()
+            lines.append(f"   ✅ Pricing: ${result['suggested_price']} suggested")
+    
+    return result
 
 
 @workflow_app.command("batch-pipeline")
@@ -1236,30 +1577,34 @@ def batch_pipeline(
     skip_photos: bool = typer.Option(False, help="Skip photo processing"),
     skip_ai: bool = typer.Option(False, help="Skip AI content generation"),
     skip_pricing: bool = typer.Option(False, help="Skip pricing analysis"),
-    style: str = typer.Option("professional", help="AI content style")
+    style: str = typer.Option("professional", help="AI content style"),
+    workers: Optional[int] = typer.Option(None, help="Items to process in parallel (default: CPU count, or 8 with --threads)"),
+    threads: bool = typer.Option(False, "--threads", help="Run items on threads instead of processes (suits I/O-bound runs, e.g. with --skip-photos)"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show each item's progress and full tracebacks for failed items")
 ):
     """Run pipeline for all items found in photo directory."""
+    from thriftbot.db import filter_existing_skus
+    
+    if skip_photos and skip_ai and skip_pricing:
+        typer.echo("⚠️  Nothing to do - all pipeline stages are skipped")
+        return
     
     try:
-        from thriftbot.images import batch_process_directory, _extract_sku_from_filename
-        from thriftbot.db import get_item_by_sku
-        from pathlib import Path
+        images = _images_module()
         
         typer.echo(f"🚀 Starting batch pipeline from {input_dir}...")
         
-        # Find all photos and extract SKUs
+        # Build the directory paths once; every item gets the same Path objects
         input_path = Path(input_dir)
-        all_photos = []
-        for file_path in input_path.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tiff'}:
-                all_photos.append(file_path)
-        
-        # Extract unique SKUs
-        skus = set()
-        for photo in all_photos:
-            sku = _extract_sku_from_filename(photo.name)
-            if sku and get_item_by_sku(sku):
-                skus.add(sku)
+        output_path = Path("processed")
+        
+        # Scan the photo directory once, grouping photos by SKU
+        photo_index = images.build_photo_index(images.iter_photo_files(input_path))
+        
+        # Keep the SKUs that exist in inventory, in the order their photos were
+        # found; only the printed output is sorted
+        known_skus = filter_existing_skus(list(photo_index))
+        skus = [sku for sku in photo_index if sku in known_skus]
         
         if not skus:
             typer.echo(f"   ⚠️  No valid SKUs found in {input_dir}")
@@ -1267,79 +1612,103 @@ def batch_pipeline(
         
         typer.echo(f"   Found {len(skus)} items to process: {', '.join(sorted(skus))}")
         
+        if not skip_photos:
+            output_path.mkdir(parents=True, exist_ok=True)
+        
         batch_results = {
             "total_items": len(skus),
             "successful": 0,
-            "failed": 0,
-            "results": {}
+            "ai_cache_hits": 0,
+            "ai_cache_misses": 0,
+            "failures": {}
         }
         
-        # Process each SKU through pipeline
-        for i, sku in enumerate(sorted(skus), 1):
-            typer.echo(f"\n{'='*40}")
-            typer.echo(f"📄 Processing item {i}/{len(skus)}: {sku}")
-            typer.echo(f"{'='*40}")
+        # Suggested prices are saved in the background as items finish
+        price_writer = None if skip_pricing else _PriceWriter()
+        
+        # Process SKUs in parallel, reporting each as it finishes. Processes suit
+        # CPU-heavy photo work; threads avoid worker start-up when the items
+        # mostly wait on the AI API and the database.
+        if threads:
+            workers = min(workers or BATCH_THREAD_WORKERS, len(skus))
+            typer.echo(f"   Using {workers} worker thread(s)")
+            executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            workers = min(workers or os.cpu_count() or 1, len(skus))
+            typer.echo(f"   Using {workers} worker process(es)")
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker)
+        
+        with executor:
+            futures = {
+                executor.submit(
+                    _run_batch_item, sku, input_path, output_path, photo_index[sku], skip_photos, skip_ai, skip_pricing, style
+                ): sku
+                for sku in skus
+            }
             
-            try:
-                # Run individual pipeline (reuse the logic but simplified)
-                success = True
-                
-                # Photo processing
-                if not skip_photos:
-                    from thriftbot.images import process_item_photos, find_item_photos
+            # Each item's report is written in a single call with --verbose;
+            # otherwise one progress bar updates in place
+            out = _OutputBuffer()
+            
+            with typer.progressbar(
+                as_completed(futures), length=len(skus), label="   Processing", hidden=verbose
+            ) as progress:
+                for i, future in enumerate(progress, 1):
+                    sku = futures[future]
+                    ok, result = _safe_call(future.result, verbose=verbose)
                     
-                    photo_files = find_item_photos(sku, input_path)
-                    if photo_files:
-                        result = process_item_photos(sku=sku, input_dir=input_dir, output_dir="processed")
-                        typer.echo(f"   ✅ Photos: {result['processed_count']} files")
+                    if ok:
+                        if result["suggested_price"] is not None:
+                            price_writer.put(sku, result["suggested_price"])
+                        if result["ai_cached"] is not None:
+                            batch_results["ai_cache_hits" if result["ai_cached"] else "ai_cache_misses"] += 1
+                        batch_results["successful"] += 1
                     else:
-                        typer.echo(f"   ⚠️  No photos found")
-                
-                # AI content
-                if not skip_ai:
-                    from thriftbot.ai import generate_listing_content
-                    content = generate_listing_content(sku=sku, style=style)
-                    typer.echo(f"   ✅ AI: {content['generated_by']} content generated")
-                
-                # Pricing
-                if not skip_pricing:
-                    from thriftbot.pricing import analyze_item_pricing
-                    from thriftbot.db import update_item_pricing
+                        # With --verbose the error is a traceback; its last line is the message
+                        batch_results["failures"][sku] = result.splitlines()[-1] if verbose else result
                     
-                    analysis = analyze_item_pricing(sku)
-                    competitive_price = analysis["pricing_analysis"]["suggested_prices"]["competitive"]
-                    update_item_pricing(sku, suggested_price=competitive_price)
-                    typer.echo(f"   ✅ Pricing: ${competitive_price} suggested")
-                
-                batch_results["successful"] += 1
-                batch_results["results"][sku] = "success"
-                typer.echo(f"   ✅ {sku} completed successfully")
-                
-            except Exception as e:
-                batch_results["failed"] += 1
-                batch_results["results"][sku] = str(e)
-                typer.echo(f"   ❌ {sku} failed: {e}")
-                success = False
-        
-        # Batch Summary
-        typer.echo(f"\n" + "="*60)
-        typer.echo(f"🏁 BATCH PIPELINE COMPLETE")
-        typer.echo(f"="*60)
-        
-        typer.echo(f"\nResults:")
-        typer.echo(f"   Total items processed: {batch_results['total_items']}")
-        typer.echo(f"   ✅ Successful: {batch_results['successful']}")
-        typer.echo(f"   ❌ Failed: {batch_results['failed']}")
-        
-        if batch_results["failed"] > 0:
-            typer.echo(f"\n❌ Failed items:")
-            for sku, result in batch_results["results"].items():
-                if result != "success":
-                    typer.echo(f"   - {sku}: {result}")
-        
-        typer.echo(f"\n📝 Next steps:")
-        typer.echo(f"   - Review items: python -m thriftbot item list --show-pricing")
-        typer.echo(f"   - Export all: python -m thriftbot export ebay-csv")
+                    if not verbose:
+                        continue
+                    
+                    out.echo(f"\n{'='*40}")
+                    out.echo(f"📄 Processed item {i}/{len(skus)}: {sku}")
+                    out.echo(f"{'='*40}")
+                    if ok:
+                        for line in result["lines"]:
+                            out.echo(line)
+                        out.echo(f"   ✅ {sku} completed successfully")
+                    else:
+                        out.echo(f"   ❌ {sku} failed: {result}")
+                    out.flush()
+        
+        if price_writer:
+            saved = price_writer.close()
+            if saved:
+                typer.echo(f"\n💾 Saved suggested prices for {saved} items")
+        
+        # Batch Summary, written in one go
+        out = _OutputBuffer()
+        out.echo(f"\n" + "="*60)
+        out.echo(f"🏁 BATCH PIPELINE COMPLETE")
+        out.echo(f"="*60)
+        
+        out.echo(f"\nResults:")
+        out.echo(f"   Total items processed: {batch_results['total_items']}")
+        out.echo(f"   ✅ Successful: {batch_results['successful']}")
+        out.echo(f"   ❌ Failed: {len(batch_results['failures'])}")
+        # Template content (--skip-ai or no API key) never goes through the cache
+        if batch_results["ai_cache_hits"] + batch_results["ai_cache_misses"]:
+            out.echo(f"   💾 AI cache: {batch_results['ai_cache_hits']} hits, {batch_results['ai_cache_misses']} misses")
+        
+        if batch_results["failures"]:
+            out.echo(f"\n❌ Failed items:")
+            for sku, error in sorted(batch_results["failures"].items()):
+                out.echo(f"   - {sku}: {error}")
+        
+        out.echo(f"\n📝 Next steps:")
+        out.echo(f"   - Review items: python -m thriftbot item list --show-pricing")
+        out.echo(f"   - Export all: python -m thriftbot export ebay-csv")
+        out.flush()
         
     except Exception as e:
         typer.echo(f"\u274c Batch pipeline error: {e}", err=True)
@@ -1354,9 +1723,9 @@ def setup_ebay_oauth(
     """Set up eBay OAuth2 authentication."""
     
     try:
-        from thriftbot.ebay_client import eBayAPIClient
+        from thriftbot.ebay_client import get_client
         
-        client = eBayAPIClient(sandbox=sandbox)
+        client = get_client(sandbox)
         
         # Generate OAuth URL
         oauth_url = client.get_oauth_url(state="thriftbot_setup")
@@ -1395,11 +1764,11 @@ def create_ebay_listing(
     """Create eBay listing directly via API."""
     
     try:
-        from thriftbot.ebay_client import create_ebay_listing_from_sku, eBayAPIClient
+        from thriftbot.ebay_client import create_ebay_listing_from_sku, get_client
         
         typer.echo(f"🚀 Creating eBay listing for {sku} ({'sandbox' if sandbox else 'production'})...")
         
-        client = eBayAPIClient(sandbox=sandbox)
+        client = get_client(sandbox)
         result = create_ebay_listing_from_sku(sku, client)
         
         if result["success"]:
@@ -1439,12 +1808,11 @@ def market_research(
     """Research completed eBay listings for market data."""
     
     try:
-        from thriftbot.ebay_client import eBayAPIClient
-        from tabulate import tabulate
+        from thriftbot.ebay_client import get_client
         
         typer.echo(f"🔍 Researching eBay market for: '{keywords}'...")
         
-        client = eBayAPIClient(sandbox=sandbox)
+        client = get_client(sandbox)
         results = client.search_completed_items(keywords, category, limit)
         
         if results:
@@ -1466,7 +1834,7 @@ def market_research(
                 ])
             
             headers = ["Title", "Sold Price", "Condition", "Type"]
-            typer.echo("\n" + tabulate(table_data, headers=headers, tablefmt="grid"))
+            typer.echo("\n" + _render_table(headers, table_data))
             
             # Summary stats
             avg_price = total_price / len(results)
@@ -1495,13 +1863,11 @@ def check_orders(
     """Check recent eBay orders and sync with inventory."""
     
     try:
-        from thriftbot.ebay_client import eBayAPIClient, sync_orders_with_inventory
-        from datetime import datetime, timedelta
-        from tabulate import tabulate
+        from thriftbot.ebay_client import get_client, sync_orders_with_inventory
         
         typer.echo(f"📦 Checking eBay orders from last {days} days...")
         
-        client = eBayAPIClient(sandbox=sandbox)
+        client = get_client(sandbox)
         
         # Get recent orders
         start_date = (datetime.utcnow() - timedelta(days=days)).isoformat() + "Z"
@@ -1543,6 +1909,8 @@ def check_orders(
                     "\n".join(items[:2])  # Show max 2 items
                 ])
             
+            from tabulate import tabulate
+            
             headers = ["Order ID", "Buyer", "Total", "Status", "Items"]
             typer.echo("\n" + tabulate(table_data, headers=headers, tablefmt="grid"))
             
@@ -1582,11 +1950,11 @@ def check_ebay_status(
     """Check eBay API connection status and account info."""
     
     try:
-        from thriftbot.ebay_client import eBayAPIClient
+        from thriftbot.ebay_client import get_client
         
         typer.echo(f"🔍 Checking eBay API status ({'sandbox' if sandbox else 'production'})...")
         
-        client = eBayAPIClient(sandbox=sandbox)
+        client = get_client(sandbox)
         
         # Test authentication
         try:
@@ -1636,25 +2004,23 @@ def test_ebay_integration(
     sandbox: bool = typer.Option(True, help="Use sandbox environment")
 ):
     """Test eBay API integration with sample data."""
+    from thriftbot.db import get_item_by_sku, get_inventory_items
     
     try:
-        from thriftbot.ebay_client import eBayAPIClient, _build_ebay_listing_data
-        from thriftbot.db import get_inventory_items
-        import json
+        from thriftbot.ebay_client import get_client, _build_ebay_listing_data
         
         typer.echo(f"🧪 Testing eBay API integration ({'sandbox' if sandbox else 'production'})...")
         
-        client = eBayAPIClient(sandbox=sandbox)
+        client = get_client(sandbox)
         
         # Get test item
         if sku:
-            from thriftbot.db import get_item_by_sku
             item = get_item_by_sku(sku)
             if not item:
                 typer.echo(f"❌ Item with SKU {sku} not found")
                 return
         else:
-            items = get_inventory_items()
+            items = get_inventory_items(limit=1)
             if not items:
                 typer.echo(f"❌ No items found in inventory for testing")
                 return
@@ -5,16 +5,23 @@ SQLModel-based database layer for inventory management and profit tracking.
 """
 
 import os
-from datetime import datetime
-from typing import Optional, List
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Tuple, Set
 from decimal import Decimal
 
 from sqlmodel import SQLModel, Field, Session, create_engine, select
-from sqlalchemy import Column, DateTime, func
+from sqlalchemy import Column, DateTime, func, insert, update, inspect, bindparam
+from sqlalchemy.orm import raiseload
 
 # Database configuration
 DATABASE_URL = os.getenv("THRIFTBOT_DB", "sqlite:///thriftbot.db")
-engine = create_engine(DATABASE_URL, echo=False)
+engine = create_engine(DATABASE_URL, echo=os.getenv("THRIFTBOT_DB_ECHO", "").lower() in ("1", "true"))
+
+# Items cached by get_item_by_sku inside item_cache_scope(); None outside a scope
+_item_cache: ContextVar[Optional[Dict[str, "InventoryItem"]]] = ContextVar("_item_cache", default=None)
 
 
 class InventoryItem(SQLModel, table=True):
@@ -112,9 +119,32 @@ class MarketComparable(SQLModel, table=True):
     )
 
 
+class AIResponseCache(SQLModel, table=True):
+    """Cached OpenAI completions keyed by a hash of the request."""
+    
+    key: str = Field(primary_key=True)  # blake2b of model, temperature and messages
+    response: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PricingAnalysisCache(SQLModel, table=True):
+    """Cached pricing analyses, one per SKU."""
+    
+    sku: str = Field(primary_key=True)
+    fingerprint: str  # Hash of the item fields the analysis was computed from
+    analysis: str  # JSON-encoded analysis
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 def init_database():
-    """Initialize the database by creating all tables."""
-    SQLModel.metadata.create_all(engine)
+    """Initialize the database by creating any tables that don't exist yet."""
+    
+    # One inspection query instead of create_all's existence check per table
+    existing = set(inspect(engine).get_table_names())
+    missing = [table for table in SQLModel.metadata.sorted_tables if table.name not in existing]
+    
+    if missing:
+        SQLModel.metadata.create_all(engine, tables=missing, checkfirst=False)
 
 
 def get_session():
@@ -123,7 +153,7 @@ def get_session():
         yield session
 
 
-def add_item_to_inventory(
+def _insert_item_statement(
     sku: str,
     category: str,
     brand: str,
@@ -132,10 +162,13 @@ def add_item_to_inventory(
     size: Optional[str] = None,
     color: Optional[str] = None,
     condition: str = "Good"
-) -> int:
-    """Add a new item to inventory."""
+):
+    """Build the INSERT ... RETURNING id statement for a new inventory item."""
     
-    item = InventoryItem(
+    # A Core INSERT ... RETURNING skips the ORM's flush and refresh round trip.
+    # The timestamp columns have no client-side defaults at this level, so set them here.
+    now = datetime.utcnow()
+    return insert(InventoryItem).values(
         sku=sku,
         category=category,
         brand=brand,
@@ -143,41 +176,200 @@ def add_item_to_inventory(
         size=size,
         color=color,
         condition=condition,
-        cost=Decimal(str(cost))
-    )
+        cost=Decimal(str(cost)),
+        created_at=now,
+        updated_at=now
+    ).returning(InventoryItem.id)
+
+
+def add_item_to_inventory(
+    sku: str,
+    category: str,
+    brand: str,
+    name: str,
+    cost: float,
+    size: Optional[str] = None,
+    color: Optional[str] = None,
+    condition: str = "Good"
+) -> int:
+    """Add a new item to inventory."""
+    
+    statement = _insert_item_statement(sku, category, brand, name, cost, size, color, condition)
     
     with Session(engine) as session:
-        session.add(item)
+        item_id = session.execute(statement).scalar_one()
+        session.commit()
+        clear_item_cache()
+        return item_id
+
+
+def add_item_if_sku_free(
+    sku: str,
+    category: str,
+    brand: str,
+    name: str,
+    cost: float,
+    size: Optional[str] = None,
+    color: Optional[str] = None,
+    condition: str = "Good"
+) -> Optional[int]:
+    """Add a new item unless its SKU is already taken.
+    
+    The SKU check and the insert share one session and transaction. Returns
+    the new item's id, or None if the SKU exists.
+    """
+    
+    with Session(engine) as session:
+        taken = session.exec(select(InventoryItem.id).where(InventoryItem.sku == sku).limit(1)).first()
+        if taken is not None:
+            return None
+        
+        statement = _insert_item_statement(sku, category, brand, name, cost, size, color, condition)
+        item_id = session.execute(statement).scalar_one()
         session.commit()
-        session.refresh(item)
-        return item.id
+        clear_item_cache()
+        return item_id
+
+
+def _filter_inventory(statement, status: Optional[str] = None, category: Optional[str] = None):
+    """Apply the optional status and category filters to an inventory query."""
+    
+    if status:
+        statement = statement.where(InventoryItem.status == status)
+    if category:
+        statement = statement.where(InventoryItem.category == category)
+    return statement
 
 
 def get_inventory_items(
     status: Optional[str] = None,
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None
 ) -> List[InventoryItem]:
-    """Get inventory items with optional filtering."""
+    """Get inventory items with optional filtering and paging."""
     
     with Session(engine) as session:
-        statement = select(InventoryItem)
+        # Every column is loaded by this one query; raise instead of silently
+        # issuing a query per row if a lazy relationship is ever added.
+        statement = _filter_inventory(select(InventoryItem).options(raiseload("*")), status, category)
         
-        if status:
-            statement = statement.where(InventoryItem.status == status)
-        if category:
-            statement = statement.where(InventoryItem.category == category)
+        if limit is not None:
+            statement = statement.limit(limit)
+        if offset:
+            statement = statement.offset(offset)
             
         items = session.exec(statement).all()
         return list(items)
 
 
+def count_inventory_items(status: Optional[str] = None, category: Optional[str] = None) -> int:
+    """Count inventory items without loading them."""
+    
+    with Session(engine) as session:
+        statement = _filter_inventory(select(func.count()).select_from(InventoryItem), status, category)
+        return session.exec(statement).one()
+
+
+def get_inventory_items_with_summary(
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Tuple[List[InventoryItem], Dict[str, float]]:
+    """Get a page of inventory items plus totals over all matching items in one query.
+    
+    The totals are window aggregates, which are computed before LIMIT applies.
+    """
+    
+    with Session(engine) as session:
+        statement = _filter_inventory(
+            select(
+                InventoryItem,
+                func.count().over(),
+                func.coalesce(func.sum(InventoryItem.cost).over(), 0),
+                func.coalesce(func.sum(InventoryItem.suggested_price).over(), 0)
+            ).options(raiseload("*")),
+            status,
+            category
+        )
+        
+        if limit is not None:
+            statement = statement.limit(limit)
+        
+        rows = session.exec(statement).all()
+        
+        if not rows:
+            return [], {"count": 0, "total_cost": 0.0, "total_value": 0.0}
+        
+        _, count, total_cost, total_value = rows[0]
+        return [row[0] for row in rows], {
+            "count": count,
+            "total_cost": float(total_cost),
+            "total_value": float(total_value)
+        }
+
+
 def get_item_by_sku(sku: str) -> Optional[InventoryItem]:
-    """Get an inventory item by SKU."""
+    """Get an inventory item by SKU.
+    
+    Inside item_cache_scope() found items are cached, so the pipeline steps
+    that each look up the same item share one query. Outside a scope every
+    call queries the database.
+    """
+    
+    cache = _item_cache.get()
+    if cache is not None and sku in cache:
+        return cache[sku]
     
     with Session(engine) as session:
         statement = select(InventoryItem).where(InventoryItem.sku == sku)
         item = session.exec(statement).first()
-        return item
+    
+    # Misses aren't cached, so an item added later in the scope is found
+    if cache is not None and item is not None:
+        cache[sku] = item
+    return item
+
+
+@contextmanager
+def item_cache_scope():
+    """Cache get_item_by_sku lookups until the block exits.
+    
+    Scope the cache to one item's run (e.g. one pipeline) and treat the
+    cached items as read-only. Every inventory write in this module clears
+    the cache. Nested scopes share the outer cache. Threads started inside
+    a scope only see it if they run in a copy of the caller's context.
+    """
+    
+    if _item_cache.get() is not None:
+        yield
+        return
+    
+    token = _item_cache.set({})
+    try:
+        yield
+    finally:
+        _item_cache.reset(token)
+
+
+def clear_item_cache():
+    """Forget cached get_item_by_sku results after inventory changes."""
+    
+    cache = _item_cache.get()
+    if cache is not None:
+        cache.clear()
+
+
+def filter_existing_skus(skus: List[str]) -> Set[str]:
+    """Return which of the given SKUs are in inventory, in one query."""
+    
+    if not skus:
+        return set()
+    
+    with Session(engine) as session:
+        # Only the SKU column is fetched; no items are loaded
+        statement = select(InventoryItem.sku).where(InventoryItem.sku.in_(skus))
+        return set(session.exec(statement))
 
 
 def update_item_pricing(
@@ -210,9 +402,78 @@ def update_item_pricing(
         
         session.add(item)
         session.commit()
+        clear_item_cache()
         return True
 
 
+def update_suggested_prices(prices: Dict[str, float]) -> int:
+    """Set suggested prices for many items in one transaction.
+    
+    Takes a mapping of SKU to suggested price and returns the number of
+    items updated.
+    """
+    
+    if not prices:
+        return 0
+    
+    table = InventoryItem.__table__
+    statement = (
+        update(table)
+        .where(table.c.sku == bindparam("item_sku"))
+        .values(suggested_price=bindparam("price"))
+    )
+    params = [{"item_sku": sku, "price": Decimal(str(price))} for sku, price in prices.items()]
+    
+    with Session(engine) as session:
+        result = session.execute(statement, params)
+        session.commit()
+        clear_item_cache()
+        return result.rowcount
+
+
+def mark_items_sold(sold_prices: Dict[str, float]) -> int:
+    """Record sale prices for many items in one transaction.
+    
+    Takes a mapping of SKU to sold price, marks each matching item as sold
+    with its fees and profit worked out, and returns the number updated.
+    """
+    
+    if not sold_prices:
+        return 0
+    
+    with Session(engine) as session:
+        statement = select(InventoryItem).where(InventoryItem.sku.in_(list(sold_prices)))
+        items = session.exec(statement).all()
+        sold_at = datetime.utcnow()
+        
+        for item in items:
+            item.sold_price = Decimal(str(sold_prices[item.sku]))
+            item.status = "sold"
+            item.sold_at = sold_at
+            _calculate_fees_and_profit(item)
+            session.add(item)
+        
+        session.commit()
+        clear_item_cache()
+        return len(items)
+
+
+def update_photo_paths(sku: str, photo_paths: List[str]) -> bool:
+    """Store an item's photo paths with a single UPDATE."""
+    
+    statement = (
+        update(InventoryItem)
+        .where(InventoryItem.sku == sku)
+        .values(photo_paths=json.dumps(photo_paths))
+    )
+    
+    with Session(engine) as session:
+        result = session.execute(statement)
+        session.commit()
+        clear_item_cache()
+        return result.rowcount > 0
+
+
 def _calculate_fees_and_profit(item: InventoryItem):
     """Calculate eBay fees and profit margins."""
     
@@ -269,6 +530,7 @@ def update_ai_content(
         
         session.add(item)
         session.commit()
+        clear_item_cache()
         return True
 
 
@@ -307,3 +569,62 @@ def add_market_comparable(
         session.commit()
         session.refresh(comparable)
         return comparable.id
+
+
+def get_market_data_version() -> str:
+    """Get a token that changes whenever market comparables are added or removed."""
+    
+    with Session(engine) as session:
+        count, last_id = session.exec(
+            select(func.count(MarketComparable.id), func.max(MarketComparable.id))
+        ).one()
+        return f"{count}:{last_id}"
+
+
+def get_cached_ai_response(key: str, max_age_days: int = 30) -> Optional[str]:
+    """Get a cached AI response if one exists and hasn't expired."""
+    
+    with Session(engine) as session:
+        entry = session.get(AIResponseCache, key)
+        
+        if not entry or entry.created_at < datetime.utcnow() - timedelta(days=max_age_days):
+            return None
+        return entry.response
+
+
+def save_ai_response(key: str, response: str):
+    """Store an AI response in the cache, replacing any existing entry."""
+    
+    with Session(engine) as session:
+        entry = session.get(AIResponseCache, key)
+        if entry:
+            entry.response = response
+            entry.created_at = datetime.utcnow()
+        else:
+            entry = AIResponseCache(key=key, response=response)
+        
+        session.add(entry)
+        session.commit()
+
+
+def get_cached_pricing_analysis(sku: str, fingerprint: str, max_age_hours: int = 24) -> Optional[str]:
+    """Get a cached pricing analysis if the item is unchanged and it hasn't expired."""
+    
+    with Session(engine) as session:
+        entry = session.get(PricingAnalysisCache, sku)
+        
+        if (
+            not entry
+            or entry.fingerprint != fingerprint
+            or entry.created_at < datetime.utcnow() - timedelta(hours=max_age_hours)
+        ):
+            return None
+        return entry.analysis
+
+
+def save_pricing_analysis(sku: str, fingerprint: str, analysis: str):
+    """Store a pricing analysis, replacing any existing entry for the SKU."""
+    
+    with Session(engine) as session:
+        session.merge(PricingAnalysisCache(sku=sku, fingerprint=fingerprint, analysis=analysis))
+        session.commit()
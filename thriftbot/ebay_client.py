@@ -7,17 +7,23 @@ Complete eBay API integration for direct listing management and market research.
 import os
 import json
 import base64
+import hashlib
+import functools
+from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import requests
 from requests.auth import HTTPBasicAuth
 from dotenv import load_dotenv
 
-from thriftbot.db import get_item_by_sku, InventoryItem, update_item_pricing
+from thriftbot.db import get_item_by_sku, InventoryItem, mark_items_sold
 
 # Load environment variables
 load_dotenv()
 
+# Access tokens are cached here between runs so each command doesn't refresh
+EBAY_TOKEN_CACHE_DIR = os.getenv("EBAY_TOKEN_CACHE_DIR", "~/.thriftbot")
+
 
 class eBayAPIClient:
     """Complete eBay API client for Sell API and Finding API integration."""
@@ -58,8 +64,11 @@ class eBayAPIClient:
         """Get or refresh access token for API calls."""
         
         # Check if current token is still valid
-        if (self.access_token and self.token_expires_at and 
-            datetime.utcnow() < self.token_expires_at - timedelta(minutes=5)):
+        if self._token_is_fresh():
+            return self.access_token
+        
+        # Reuse a token saved by an earlier command
+        if self._load_cached_token():
             return self.access_token
         
         # Get new token
@@ -95,10 +104,57 @@ class eBayAPIClient:
             self.access_token = token_data["access_token"]
             expires_in = token_data.get("expires_in", 7200)  # Default 2 hours
             self.token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
+            self._save_cached_token()
             return self.access_token
         else:
             raise Exception(f"Failed to refresh token: {response.status_code} - {response.text}")
     
+    def _token_is_fresh(self) -> bool:
+        """Check the access token has more than five minutes left."""
+        return bool(
+            self.access_token and self.token_expires_at and
+            datetime.utcnow() < self.token_expires_at - timedelta(minutes=5)
+        )
+    
+    def _token_cache_path(self) -> Path:
+        environment = "sandbox" if self.sandbox else "production"
+        return Path(EBAY_TOKEN_CACHE_DIR).expanduser() / f"ebay_token_{environment}.json"
+    
+    def _token_owner(self) -> str:
+        """Identify the credentials a cached token was issued for."""
+        return hashlib.sha256(f"{self.client_id}:{self.refresh_token}".encode("utf-8")).hexdigest()
+    
+    def _load_cached_token(self) -> bool:
+        """Load a saved access token if it's for these credentials and still fresh."""
+        
+        try:
+            cached = json.loads(self._token_cache_path().read_text(encoding="utf-8"))
+            if cached.get("owner") != self._token_owner():
+                return False
+            self.access_token = cached["access_token"]
+            self.token_expires_at = datetime.fromisoformat(cached["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return self._token_is_fresh()
+    
+    def _save_cached_token(self):
+        """Save the access token for later commands; the cache is best-effort."""
+        
+        path = self._token_cache_path()
+        data = json.dumps({
+            "owner": self._token_owner(),
+            "access_token": self.access_token,
+            "expires_at": self.token_expires_at.isoformat()
+        })
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Readable by the current user only; it's a live credential
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+        except OSError:
+            pass
+    
     def get_oauth_url(self, state: str = None) -> str:
         """Get OAuth2 authorization URL for initial setup."""
         
@@ -305,12 +361,18 @@ class eBayAPIClient:
             raise Exception(f"Finding API request failed: {response.status_code} - {response.text}")
 
 
+@functools.lru_cache(maxsize=2)
+def get_client(sandbox: bool = True) -> eBayAPIClient:
+    """Get the shared API client for an environment, creating it on first use."""
+    return eBayAPIClient(sandbox=sandbox)
+
+
 # High-level integration functions
 def create_ebay_listing_from_sku(sku: str, client: eBayAPIClient = None) -> Dict[str, Any]:
     """Create complete eBay listing from ThriftBot inventory item."""
     
     if not client:
-        client = eBayAPIClient()
+        client = get_client()
     
     # Get item from database
     item = get_item_by_sku(sku)
@@ -460,7 +522,7 @@ def _guess_ebay_category(category: str) -> str:
 def sync_orders_with_inventory() -> Dict[str, Any]:
     """Sync eBay orders with ThriftBot inventory status."""
     
-    client = eBayAPIClient()
+    client = get_client()
     
     try:
         # Get recent orders
@@ -475,25 +537,25 @@ def sync_orders_with_inventory() -> Dict[str, Any]:
             "errors": []
         }
         
-        # Process each order
+        # Collect sold prices from each order, then mark the items sold together
+        sold_prices = {}
         for order in orders.get("orders", []):
             try:
-                # Update inventory status for sold items
+                order_prices = {}
                 for line_item in order.get("lineItems", []):
                     sku = line_item.get("sku")
                     if sku:
-                        # Update database - mark as sold
-                        item = get_item_by_sku(sku)
-                        if item:
-                            sold_price = float(line_item.get("total", {}).get("value", 0))
-                            update_item_pricing(sku, sold_price=sold_price)
-                            sync_results["items_updated"] += 1
+                        order_prices[sku] = float(line_item.get("total", {}).get("value", 0))
                 
+                sold_prices.update(order_prices)
                 sync_results["orders_processed"] += 1
                 
             except Exception as e:
                 sync_results["errors"].append(f"Order {order.get('orderId', 'unknown')}: {str(e)}")
         
+        # Update database - one transaction for every sold item we track
+        sync_results["items_updated"] = mark_items_sold(sold_prices)
+        
         return sync_results
         
     except Exception as e:
@@ -7,27 +7,48 @@ Export functionality for eBay-compatible CSV and other formats.
 import csv
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Callable
 from datetime import datetime
 
-from thriftbot.db import get_inventory_items, InventoryItem
+from sqlalchemy import func
+
+try:
+    from orjson import loads as _json_loads  # Optional, faster JSON parsing
+except ImportError:
+    _json_loads = json.loads
+
+from thriftbot.db import InventoryItem, Session, engine, select
+
+# Rows fetched per round trip while streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+# Rows written between progress callbacks
+EXPORT_PROGRESS_INTERVAL = 100
+
+# Output directories already created during this run
+_ENSURED_DIRS = set()
+
+
+def _ensure_parent_dir(output_path: str):
+    """Create the directory an export file goes into, once per run."""
+    parent = Path(output_path).parent
+    key = str(parent)
+    if key not in _ENSURED_DIRS:
+        parent.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(key)
 
 
 def export_to_ebay_csv(
     output_path: str,
     include_sold: bool = False,
-    category_filter: str = None
+    category_filter: str = None,
+    progress: Optional[Callable[[int], None]] = None
 ) -> Dict[str, Any]:
-    """Export inventory to eBay-compatible CSV format."""
+    """Export inventory to eBay-compatible CSV format.
     
-    # Get inventory items
-    items = get_inventory_items()
-    
-    if not include_sold:
-        items = [item for item in items if item.status != "sold"]
-        
-    if category_filter:
-        items = [item for item in items if item.category.lower() == category_filter.lower()]
+    If given, progress is called with the running row count every
+    EXPORT_PROGRESS_INTERVAL rows.
+    """
     
     # eBay CSV headers (standard bulk upload format)
     headers = [
@@ -60,22 +81,40 @@ def export_to_ebay_csv(
         "ReturnPolicy.ShippingCostPaidByOption"
     ]
     
-    # Write CSV file
-    with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
+    # Stream items from the database straight into a buffered CSV file
+    count = 0
+    _ensure_parent_dir(output_path)
+    with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(headers)
         
-        for item in items:
-            row = _create_ebay_csv_row(item)
-            writer.writerow(row)
+        for item in _iter_export_items(include_sold, category_filter):
+            writer.writerow(_create_ebay_csv_row(item))
+            count += 1
+            if progress and count % EXPORT_PROGRESS_INTERVAL == 0:
+                progress(count)
     
     return {
-        "count": len(items),
+        "count": count,
         "path": output_path,
         "exported_at": datetime.utcnow().isoformat()
     }
 
 
+def _iter_export_items(include_sold: bool, category_filter: str = None) -> Iterator[InventoryItem]:
+    """Yield items to export, fetched from the database in batches."""
+    
+    statement = select(InventoryItem)
+    
+    if not include_sold:
+        statement = statement.where(InventoryItem.status != "sold")
+    if category_filter:
+        statement = statement.where(func.lower(InventoryItem.category) == category_filter.lower())
+    
+    with Session(engine) as session:
+        yield from session.exec(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
 def _create_ebay_csv_row(item: InventoryItem) -> List[str]:
     """Create a CSV row for eBay from an inventory item."""
     
@@ -185,10 +224,8 @@ def export_to_json(
 ) -> Dict[str, Any]:
     """Export inventory to JSON format."""
     
-    items = get_inventory_items()
-    
-    if not include_sold:
-        items = [item for item in items if item.status != "sold"]
+    # Sold items are filtered out by the query rather than after loading them
+    items = list(_iter_export_items(include_sold))
     
     if format_for_automation:
         # Format for browser automation
@@ -215,6 +252,7 @@ def export_to_json(
         }
     
     # Write JSON file
+    _ensure_parent_dir(output_path)
     with open(output_path, 'w', encoding='utf-8') as jsonfile:
         json.dump(export_data, jsonfile, indent=2, default=str)
     
@@ -266,12 +304,19 @@ def _create_automation_listing(item: InventoryItem) -> Dict[str, Any]:
             "return_shipping_paid_by": "Buyer"
         },
         "photos": {
-            "paths": json.loads(item.processed_photos) if item.processed_photos else [],
+            "paths": _json_list(item.processed_photos),
             "upload_required": True
         }
     }
 
 
+def _json_list(value: str) -> List[Any]:
+    """Parse a JSON list column, skipping the parser for missing or empty lists."""
+    if not value or value == "[]":
+        return []
+    return _json_loads(value)
+
+
 def _item_to_dict(item: InventoryItem) -> Dict[str, Any]:
     """Convert inventory item to dictionary."""
     
@@ -301,8 +346,8 @@ def _item_to_dict(item: InventoryItem) -> Dict[str, Any]:
         },
         "status": item.status,
         "photos": {
-            "original": json.loads(item.photo_paths) if item.photo_paths else [],
-            "processed": json.loads(item.processed_photos) if item.processed_photos else []
+            "original": _json_list(item.photo_paths),
+            "processed": _json_list(item.processed_photos)
         },
         "timestamps": {
             "created_at": item.created_at.isoformat() if item.created_at else None,
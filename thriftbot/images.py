@@ -5,15 +5,21 @@ Photo processing utilities for eBay listings including background removal,
 resizing, and optimization for e-commerce.
 """
 
+import io
 import os
+import re
 import json
+import queue
+import functools
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable, Union, Callable
 from PIL import Image, ImageEnhance, ImageOps
 import rembg
 from dotenv import load_dotenv
 
-from thriftbot.db import get_item_by_sku, InventoryItem
+from thriftbot.db import get_item_by_sku, filter_existing_skus, InventoryItem
 
 # Load environment variables
 load_dotenv()
@@ -21,33 +27,50 @@ load_dotenv()
 # Configuration
 MAX_PHOTO_SIZE = int(os.getenv("MAX_PHOTO_SIZE", "2048"))
 PHOTO_QUALITY = int(os.getenv("PHOTO_QUALITY", "85"))
-SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tiff'}
+SUPPORTED_FORMATS = frozenset({'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tiff'})
+PHOTO_WORKERS = int(os.getenv("PHOTO_WORKERS", str(os.cpu_count() or 1)))
+
+# Background removal model. REMBG_MODEL picks one of rembg's bundled models
+# (e.g. the smaller, faster "u2netp"); REMBG_MODEL_PATH loads a custom ONNX
+# file instead, such as an INT8-quantized U²-Net.
+REMBG_MODEL = os.getenv("REMBG_MODEL", "u2net")
+REMBG_MODEL_PATH = os.getenv("REMBG_MODEL_PATH")
+
+_rembg_session_instance = None
+_rembg_session_lock = threading.Lock()
 
 
 def process_item_photos(
     sku: str,
-    input_dir: str = "photos",
-    output_dir: str = "processed",
+    input_dir: Union[str, Path] = "photos",
+    output_dir: Union[str, Path] = "processed",
     remove_background: bool = True,
     enhance: bool = True,
-    create_variants: bool = True
+    create_variants: bool = True,
+    photo_files: Optional[List[Path]] = None,
+    workers: Optional[int] = None
 ) -> Dict[str, Any]:
-    """Process all photos for an inventory item."""
+    """Process all photos for an inventory item.
+    
+    Pass ``photo_files`` when the item's photos are already known (e.g. from
+    build_photo_index) to skip searching ``input_dir`` for them. Callers
+    handling many items should pass the directories as Path objects.
+    ``workers`` caps the photos processed at once (default: PHOTO_WORKERS).
+    """
     
     item = get_item_by_sku(sku)
     if not item:
         raise ValueError(f"Item with SKU {sku} not found")
     
     input_path = Path(input_dir)
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
     
-    # Create item-specific directory
-    item_output_dir = output_path / sku
+    # Create item-specific directory (and the output directory with it)
+    item_output_dir = Path(output_dir) / sku
     item_output_dir.mkdir(parents=True, exist_ok=True)
     
     # Find photos for this item
-    photo_files = find_item_photos(sku, input_path)
+    if photo_files is None:
+        photo_files = find_item_photos(sku, input_path)
     
     if not photo_files:
         raise ValueError(f"No photos found for SKU {sku} in {input_path}")
@@ -55,27 +78,47 @@ def process_item_photos(
     processed_photos = []
     processing_log = []
     
-    for i, photo_path in enumerate(photo_files):
-        try:
-            # Process each photo
-            result = process_single_photo(
+    # Encoded files are written by one background thread, so the photo
+    # workers go straight on to the next image instead of waiting on disk
+    writer = _PhotoWriter()
+    
+    # Photos are independent, and Pillow and rembg's ONNX runtime release the
+    # GIL for the heavy lifting, so a thread pool keeps every core busy
+    with ThreadPoolExecutor(max_workers=min(workers or PHOTO_WORKERS, len(photo_files))) as executor:
+        futures = [
+            executor.submit(
+                process_single_photo,
                 photo_path,
                 item_output_dir,
                 f"{sku}_{i+1:02d}",
                 remove_background=remove_background,
                 enhance=enhance,
-                create_variants=create_variants
+                create_variants=create_variants,
+                writer=writer.write
             )
-            
-            processed_photos.extend(result["files"])
-            processing_log.append(result["log"])
-            
-        except Exception as e:
-            processing_log.append({
-                "file": str(photo_path),
-                "status": "error",
-                "message": str(e)
-            })
+            for i, photo_path in enumerate(photo_files)
+        ]
+        
+        # Collect in submission order so output stays in filename order
+        for photo_path, future in zip(photo_files, futures):
+            try:
+                result = future.result()
+                processed_photos.extend(result["files"])
+                processing_log.append(result["log"])
+                
+            except Exception as e:
+                processing_log.append({
+                    "file": str(photo_path),
+                    "status": "error",
+                    "message": str(e)
+                })
+    
+    # Wait for the files to reach disk, dropping any that couldn't be written
+    write_errors = writer.close()
+    if write_errors:
+        processed_photos = [path for path in processed_photos if path not in write_errors]
+        for path, message in write_errors.items():
+            processing_log.append({"file": path, "status": "error", "message": message})
     
     # Update database with processed photo paths
     _update_item_photos(item, photo_files, processed_photos)
@@ -96,9 +139,15 @@ def process_single_photo(
     base_name: str,
     remove_background: bool = True,
     enhance: bool = True,
-    create_variants: bool = True
+    create_variants: bool = True,
+    writer: Optional[Callable[[Path, bytes], None]] = None
 ) -> Dict[str, Any]:
-    """Process a single photo with various optimizations."""
+    """Process a single photo with various optimizations.
+    
+    Encoded files are handed to ``writer`` (by default written immediately).
+    """
+    
+    write = writer or _write_file
     
     try:
         # Load image
@@ -118,7 +167,7 @@ def process_single_photo(
             # Original optimized version
             optimized_path = output_dir / f"{base_name}_optimized.jpg"
             optimized_img = _optimize_image(img, enhance=enhance)
-            optimized_img.save(optimized_path, "JPEG", quality=PHOTO_QUALITY, optimize=True)
+            write(optimized_path, _encode_image(optimized_img, "JPEG", quality=PHOTO_QUALITY, optimize=True))
             processed_files.append(str(optimized_path))
             
             # Background removed version
@@ -126,7 +175,7 @@ def process_single_photo(
                 try:
                     bg_removed_path = output_dir / f"{base_name}_no_bg.png"
                     bg_removed_img = remove_image_background(img)
-                    bg_removed_img.save(bg_removed_path, "PNG", optimize=True)
+                    write(bg_removed_path, _encode_image(bg_removed_img, "PNG", optimize=True))
                     processed_files.append(str(bg_removed_path))
                 except Exception as e:
                     print(f"⚠️  Background removal failed: {e}")
@@ -136,14 +185,14 @@ def process_single_photo(
                 # Square crop for main listing photo
                 square_path = output_dir / f"{base_name}_square.jpg"
                 square_img = create_square_crop(optimized_img)
-                square_img.save(square_path, "JPEG", quality=PHOTO_QUALITY, optimize=True)
+                write(square_path, _encode_image(square_img, "JPEG", quality=PHOTO_QUALITY, optimize=True))
                 processed_files.append(str(square_path))
                 
                 # Thumbnail
                 thumb_path = output_dir / f"{base_name}_thumb.jpg"
                 thumbnail = optimized_img.copy()
                 thumbnail.thumbnail((300, 300), Image.Resampling.LANCZOS)
-                thumbnail.save(thumb_path, "JPEG", quality=80, optimize=True)
+                write(thumb_path, _encode_image(thumbnail, "JPEG", quality=80, optimize=True))
                 processed_files.append(str(thumb_path))
             
             return {
@@ -161,6 +210,52 @@ def process_single_photo(
         raise Exception(f"Failed to process {input_path}: {str(e)}")
 
 
+def _encode_image(img: Image.Image, image_format: str, **params) -> bytes:
+    """Encode an image to bytes in the given format."""
+    
+    buffer = io.BytesIO()
+    img.save(buffer, image_format, **params)
+    return buffer.getvalue()
+
+
+def _write_file(path: Path, data: bytes):
+    path.write_bytes(data)
+
+
+class _PhotoWriter:
+    """Write encoded photo files from a single background thread."""
+    
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._errors: Dict[str, str] = {}
+        self._thread = threading.Thread(target=self._run, name="photo-writer", daemon=True)
+        self._thread.start()
+    
+    def write(self, path: Path, data: bytes):
+        self._queue.put((path, data))
+    
+    def close(self) -> Dict[str, str]:
+        """Finish queued writes and stop the thread.
+        
+        Returns the paths that couldn't be written, mapped to the error.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        return self._errors
+    
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            
+            path, data = entry
+            try:
+                path.write_bytes(data)
+            except OSError as e:
+                self._errors[str(path)] = f"Failed to write {path}: {e}"
+
+
 def _optimize_image(img: Image.Image, enhance: bool = True) -> Image.Image:
     """Optimize image for eBay listings."""
     
@@ -189,19 +284,33 @@ def remove_image_background(img: Image.Image) -> Image.Image:
     """Remove background from image using rembg."""
     
     # Convert PIL Image to bytes
-    import io
     img_byte_arr = io.BytesIO()
     img.save(img_byte_arr, format='PNG')
     img_byte_arr = img_byte_arr.getvalue()
     
     # Remove background
-    output = rembg.remove(img_byte_arr)
+    output = rembg.remove(img_byte_arr, session=_rembg_session())
     
     # Convert back to PIL Image
     result_img = Image.open(io.BytesIO(output))
     return result_img
 
 
+def _rembg_session():
+    """Load the background removal model once and share it across photos."""
+    
+    global _rembg_session_instance
+    
+    # The lock keeps concurrent photo workers from each loading the model
+    with _rembg_session_lock:
+        if _rembg_session_instance is None:
+            if REMBG_MODEL_PATH:
+                _rembg_session_instance = rembg.new_session("u2net_custom", model_path=REMBG_MODEL_PATH)
+            else:
+                _rembg_session_instance = rembg.new_session(REMBG_MODEL)
+        return _rembg_session_instance
+
+
 def create_square_crop(img: Image.Image) -> Image.Image:
     """Create a square crop of the image (useful for main listing photo)."""
     
@@ -226,17 +335,52 @@ def create_square_crop(img: Image.Image) -> Image.Image:
     return square_img
 
 
+def _has_photo_extension(name: str) -> bool:
+    """Check a filename's extension against SUPPORTED_FORMATS."""
+    # Slicing at the last dot skips splitext's generic path handling; dot > 0
+    # keeps hidden files like ".jpg" out, as splitext does
+    dot = name.rfind('.')
+    return dot > 0 and name[dot:].lower() in SUPPORTED_FORMATS
+
+
+def iter_photo_files(directory: Path) -> Iterator[Path]:
+    """Recursively yield supported image files under a directory.
+    
+    Uses os.scandir so file types come from the directory listing instead of
+    a stat call per entry. Like Path.rglob, a missing directory yields nothing.
+    Subdirectories are walked with an explicit stack of listings, in the same
+    order as recursion, so deep trees don't pass every file up through a
+    chain of nested generators.
+    """
+    
+    if not os.path.isdir(directory):
+        return
+    
+    stack = [os.scandir(directory)]
+    try:
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop().close()
+            elif entry.is_dir(follow_symlinks=False):
+                stack.append(os.scandir(entry.path))
+            elif entry.is_file() and _has_photo_extension(entry.name):
+                yield Path(entry.path)
+    finally:
+        for entries in stack:
+            entries.close()
+
+
 def find_item_photos(sku: str, search_dir: Path) -> List[Path]:
     """Find photos for a specific item SKU."""
     
     photo_files = []
+    sku_lower = sku.lower()
     
     # Look for files that start with the SKU or contain it
-    for file_path in search_dir.rglob("*"):
-        if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_FORMATS:
-            # Check if filename contains SKU
-            if sku.lower() in file_path.name.lower():
-                photo_files.append(file_path)
+    for file_path in iter_photo_files(search_dir):
+        if sku_lower in file_path.name.lower():
+            photo_files.append(file_path)
     
     # Sort by filename to ensure consistent ordering
     photo_files.sort()
@@ -244,6 +388,17 @@ def find_item_photos(sku: str, search_dir: Path) -> List[Path]:
     return photo_files
 
 
+def build_photo_index(photo_files: Iterable[Path]) -> Dict[str, List[Path]]:
+    """Group photo files by the SKU in their filenames, in filename order."""
+    
+    index = {}
+    for photo in sorted(photo_files):
+        sku = _extract_sku_from_filename(photo.name)
+        if sku:
+            index.setdefault(sku, []).append(photo)
+    return index
+
+
 def create_photo_grid(photo_paths: List[str], output_path: str, grid_size: Tuple[int, int] = (2, 2)) -> str:
     """Create a grid layout of photos for listings."""
     
@@ -352,7 +507,7 @@ def _update_item_photos(item: InventoryItem, original_paths: List[Path], process
     processed_paths_json = json.dumps(processed_paths)
     
     # Update item in database
-    from thriftbot.db import engine, Session
+    from thriftbot.db import engine, Session, clear_item_cache
     
     with Session(engine) as session:
         # Get fresh item from database
@@ -361,6 +516,7 @@ def _update_item_photos(item: InventoryItem, original_paths: List[Path], process
             item_db.photo_paths = original_paths_json
             item_db.processed_photos = processed_paths_json
             session.commit()
+            clear_item_cache()
 
 
 def get_photo_upload_suggestions(category: str) -> Dict[str, List[str]]:
@@ -420,23 +576,23 @@ def get_photo_upload_suggestions(category: str) -> Dict[str, List[str]]:
 
 
 def batch_process_directory(
-    input_dir: str = "photos",
-    output_dir: str = "processed",
+    input_dir: Union[str, Path] = "photos",
+    output_dir: Union[str, Path] = "processed",
     remove_background: bool = False,  # More conservative default for batch
-    enhance: bool = True
+    enhance: bool = True,
+    workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """Process all photos in a directory, organizing by detected SKUs."""
     
     input_path = Path(input_dir)
+    output_path = Path(output_dir)
     
     if not input_path.exists():
         raise ValueError(f"Input directory {input_dir} does not exist")
     
-    # Find all image files
-    all_photos = []
-    for file_path in input_path.rglob("*"):
-        if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_FORMATS:
-            all_photos.append(file_path)
+    # Find all image files; sorted so each SKU's photos are numbered in
+    # filename order rather than directory order
+    all_photos = sorted(iter_photo_files(input_path))
     
     if not all_photos:
         return {"message": "No photos found to process", "processed_skus": []}
@@ -463,18 +619,22 @@ def batch_process_directory(
         "errors": []
     }
     
+    # Check every detected SKU against the database in one query
+    known_skus = filter_existing_skus(list(sku_photos))
+    
     # Process each SKU's photos
     for sku, photos in sku_photos.items():
         try:
-            # Check if item exists in database
-            if get_item_by_sku(sku):
+            if sku in known_skus:
                 result = process_item_photos(
                     sku=sku,
-                    input_dir=input_dir,
-                    output_dir=output_dir,
+                    input_dir=input_path,
+                    output_dir=output_path,
                     remove_background=remove_background,
                     enhance=enhance,
-                    create_variants=True
+                    create_variants=True,
+                    photo_files=photos,
+                    workers=workers
                 )
                 results["processing_results"][sku] = result
             else:
@@ -485,21 +645,25 @@ def batch_process_directory(
     return results
 
 
+# Common SKU patterns, tried in order. Each is paired with text any match
+# must contain, so patterns that can't match are skipped without a regex scan.
+_SKU_PATTERNS = [
+    ("-", re.compile(r'(\d{2}-\d{4})')),  # Format: 25-0001
+    ("-", re.compile(r'([A-Z]{2,3}-\d{3,5})')),  # Format: ABC-123
+    ("SKU", re.compile(r'(SKU[_-]?(\w+))')),  # Format: SKU_123 or SKU-ABC
+    ("_", re.compile(r'^([A-Z0-9]{6,})_')),  # Format: ABC123_photo.jpg
+]
+
+
+@functools.lru_cache(maxsize=8192)
 def _extract_sku_from_filename(filename: str) -> Optional[str]:
     """Extract SKU from filename using common patterns."""
     
-    import re
-    
-    # Common SKU patterns
-    patterns = [
-        r'(\d{2}-\d{4})',  # Format: 25-0001
-        r'([A-Z]{2,3}-\d{3,5})',  # Format: ABC-123
-        r'(SKU[_-]?(\w+))',  # Format: SKU_123 or SKU-ABC
-        r'^([A-Z0-9]{6,})_',  # Format: ABC123_photo.jpg
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, filename.upper())
+    upper_name = filename.upper()
+    for required, pattern in _SKU_PATTERNS:
+        if required not in upper_name:
+            continue
+        match = pattern.search(upper_name)
         if match:
             return match.group(1)
     
@@ -5,21 +5,36 @@ Market research and pricing suggestion system for optimal eBay listing prices.
 """
 
 import os
+import json
+import hashlib
 from typing import Dict, List, Optional, Any
 from decimal import Decimal
-from statistics import mean, median
+from statistics import mean
 from datetime import datetime, timedelta
 
-from thriftbot.db import get_item_by_sku, InventoryItem, add_market_comparable, MarketComparable, Session, engine, select
+from thriftbot.db import (
+    get_item_by_sku, InventoryItem, add_market_comparable, MarketComparable, Session, engine, select,
+    get_cached_pricing_analysis, save_pricing_analysis, get_market_data_version
+)
 
+# How long a pricing analysis is reused for an unchanged item
+PRICING_CACHE_TTL_HOURS = int(os.getenv("PRICING_CACHE_TTL_HOURS", "24"))
 
-def analyze_item_pricing(sku: str) -> Dict[str, Any]:
+
+def analyze_item_pricing(sku: str, use_cache: bool = True) -> Dict[str, Any]:
     """Analyze pricing for an inventory item with market research."""
     
     item = get_item_by_sku(sku)
     if not item:
         raise ValueError(f"Item with SKU {sku} not found")
     
+    # Reuse a recent analysis if neither the item nor the market data has changed
+    fingerprint = _pricing_fingerprint(item, get_market_data_version())
+    if use_cache:
+        cached = _read_cached_analysis(sku, fingerprint)
+        if cached:
+            return json.loads(cached)
+    
     # Get market comparables
     market_data = get_market_comparables(item)
     
@@ -29,7 +44,7 @@ def analyze_item_pricing(sku: str) -> Dict[str, Any]:
     # Calculate potential profits at different price points
     profit_scenarios = calculate_profit_scenarios(item, pricing_analysis["suggested_prices"])
     
-    return {
+    analysis = {
         "sku": sku,
         "item_info": {
             "brand": item.brand,
@@ -43,6 +58,35 @@ def analyze_item_pricing(sku: str) -> Dict[str, Any]:
         "profit_scenarios": profit_scenarios,
         "recommendations": generate_pricing_recommendations(item, pricing_analysis, profit_scenarios)
     }
+    
+    _write_cached_analysis(sku, fingerprint, analysis)
+    return analysis
+
+
+def _read_cached_analysis(sku: str, fingerprint: str) -> Optional[str]:
+    """Look up a cached pricing analysis; cache problems are treated as a miss."""
+    
+    try:
+        return get_cached_pricing_analysis(sku, fingerprint, PRICING_CACHE_TTL_HOURS)
+    except Exception:
+        # e.g. the cache table doesn't exist until `db init` is re-run
+        return None
+
+
+def _write_cached_analysis(sku: str, fingerprint: str, analysis: Dict[str, Any]):
+    """Store a pricing analysis in the cache, ignoring cache write failures."""
+    
+    try:
+        save_pricing_analysis(sku, fingerprint, json.dumps(analysis))
+    except Exception:
+        pass
+
+
+def _pricing_fingerprint(item: InventoryItem, market_version: str) -> str:
+    """Hash the item fields and market data version a pricing analysis is computed from."""
+    
+    fields = [item.brand, item.name, item.category, item.condition, str(item.cost), market_version]
+    return hashlib.blake2b(json.dumps(fields).encode("utf-8"), digest_size=16).hexdigest()
 
 
 def get_market_comparables(item: InventoryItem, limit: int = 20) -> Dict[str, Any]:
@@ -70,16 +114,11 @@ def get_market_comparables(item: InventoryItem, limit: int = 20) -> Dict[str, An
             comparables = generate_sample_comparables(item)
         
         # Calculate statistics
-        prices = [float(comp.total_price) for comp in comparables]
+        prices = sorted(float(comp.total_price) for comp in comparables)
         
         return {
             "total_comparables": len(comparables),
-            "price_range": {
-                "min": min(prices) if prices else 0,
-                "max": max(prices) if prices else 0,
-                "average": round(mean(prices), 2) if prices else 0,
-                "median": round(median(prices), 2) if prices else 0
-            },
+            "price_range": _price_summary(prices),
             "recent_sales": [
                 {
                     "title": comp.title,
@@ -94,6 +133,31 @@ def get_market_comparables(item: InventoryItem, limit: int = 20) -> Dict[str, An
         }
 
 
+def _price_summary(sorted_prices: List[float]) -> Dict[str, float]:
+    """Summarize already-sorted prices: min, max, average and median.
+    
+    Sorting once gives min, max and median by index instead of three
+    separate passes plus the copy-and-sort inside statistics.median.
+    """
+    
+    count = len(sorted_prices)
+    if not count:
+        return {"min": 0, "max": 0, "average": 0, "median": 0}
+    
+    middle = count // 2
+    if count % 2:
+        median = sorted_prices[middle]
+    else:
+        median = (sorted_prices[middle - 1] + sorted_prices[middle]) / 2
+    
+    return {
+        "min": sorted_prices[0],
+        "max": sorted_prices[-1],
+        "average": round(mean(sorted_prices), 2),
+        "median": round(median, 2)
+    }
+
+
 def calculate_pricing_suggestions(item: InventoryItem, market_data: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate suggested pricing based on market data and item cost."""
     
@@ -215,6 +279,19 @@ def calculate_profit_scenarios(item: InventoryItem, suggested_prices: Dict[str,
     return scenarios
 
 
+def best_roi_scenario(profit_scenarios: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Pick the profit scenario with the highest ROI."""
+    
+    # One pass with a plain comparison, instead of a key function per scenario
+    best = profit_scenarios[0]
+    best_roi = best["profit"]["roi_percentage"]
+    for scenario in profit_scenarios[1:]:
+        roi = scenario["profit"]["roi_percentage"]
+        if roi > best_roi:
+            best, best_roi = scenario, roi
+    return best
+
+
 def generate_pricing_recommendations(
     item: InventoryItem,
     pricing_analysis: Dict[str, Any],
@@ -226,11 +303,11 @@ def generate_pricing_recommendations(
     cost = float(item.cost)
     
     # Analyze profit scenarios
-    best_roi_scenario = max(profit_scenarios, key=lambda x: x["profit"]["roi_percentage"])
+    best = best_roi_scenario(profit_scenarios)
     
     recommendations.append(
-        f"Best ROI: {best_roi_scenario['strategy']} pricing at ${best_roi_scenario['price']} "
-        f"({best_roi_scenario['profit']['roi_percentage']}% ROI)"
+        f"Best ROI: {best['strategy']} pricing at ${best['price']} "
+        f"({best['profit']['roi_percentage']}% ROI)"
     )
     
     # Check if any scenarios have low profit